@@ -0,0 +1,39 @@
+# Time to render the focus heatmap and trend image from years of daily rollups.
+#
+# Builds SessionLog-style day totals for N years (focus on ~70% of days) and times
+# pomodoro_charts.render_history for the last year and for the whole range.
+#
+#   python benchmarks/bench_history_chart.py [years]   (default 10)
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pomodoro_charts import render_history  # noqa: E402
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rng = random.Random(1)
+    today = datetime.date.today()
+    days = {}
+    for back in range(years * 365):
+        if rng.random() < 0.7:
+            day = today - datetime.timedelta(days=back)
+            days[day.isoformat()] = {'focus': rng.randint(1, 8) * 1500, 'completed': 1, 'skipped': 0, 'break': 0}
+    last = today.toordinal()
+    render_history(days, last - 364, last, 720)  # imports PIL and loads its font once
+    print(f"{years} years, {len(days)} days with focus")
+    for label, first in (("last year", last - 364), ("all time", last - years * 365 + 1)):
+        runs = []
+        for _ in range(5):
+            started = time.perf_counter()
+            render_history(days, first, last, 720)
+            runs.append(time.perf_counter() - started)
+        print(f"  {label}: best {min(runs) * 1000:.1f} ms of 5")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+# Memory and scan-speed benchmark for the homework model.
+# Compares the original dict-backed classes with the __slots__ classes and the columnar store.
+#
+#   python benchmarks/bench_homework_model.py [entries]   (default 1,000,000)
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from homework_store import Homework, HomeworkColumns, parse_due_ordinal  # noqa: E402
+
+
+class LegacyHomework:
+    # The model as it was before __slots__: name-mangled attributes behind properties,
+    # one __dict__ per instance and a subclass that decides whether time_required exists
+    def __init__(self, subject, title, description, due_date, status):
+        self.__subject = subject
+        self.__title = title
+        self.__description = description
+        self.__due_date = due_date
+        self.__status = status
+
+    @property
+    def subject(self):
+        return self.__subject
+
+    @property
+    def due_date(self):
+        return self.__due_date
+
+    @property
+    def status(self):
+        return self.__status
+
+
+class LegacyTimedHomework(LegacyHomework):
+    def __init__(self, subject, title, description, due_date, status, time_required):
+        super().__init__(subject, title, description, due_date, status)
+        self.__time_required = time_required
+
+    @property
+    def time_required(self):
+        return self.__time_required
+
+
+SUBJECTS = ["English", "Maths", "Physics", "Chemistry", "History", "Japanese", "Python", "Art"]
+
+
+def make_rows(n):
+    # Yields fresh strings for every row, like json.load would, so only what the
+    # model keeps hold of shows up in the memory numbers
+    rnd = random.Random(42)
+    for i in range(n):
+        due = f"2026-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+        status = "Pending" if rnd.random() < 0.6 else "Completed"
+        minutes = rnd.randint(10, 240) if rnd.random() < 0.7 else None
+        yield "".join(rnd.choice(SUBJECTS)), f"Task {i}", "", due, "".join(status), minutes
+
+
+def measure(label, build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<44} {size / 1e6:8.1f} MB")
+    return result
+
+
+def timed(label, fn, repeat=3):
+    best = min(_run(fn) for _ in range(repeat))
+    print(f"{label:<44} {best * 1000:8.1f} ms")
+
+
+def _run(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{n:,} homework entries\n")
+
+    legacy = measure("legacy classes", lambda: [
+        LegacyTimedHomework(s, t, d, due, st, m) if m is not None else LegacyHomework(s, t, d, due, st)
+        for s, t, d, due, st, m in make_rows(n)])
+    slotted = measure("__slots__ classes", lambda: [
+        Homework(s, t, d, due, st, i, m) for i, (s, t, d, due, st, m) in enumerate(make_rows(n), 1)])
+    columns = measure("columns (extra, on top)", lambda: _columns(slotted))
+    print()
+
+    # Query: pending minutes for one subject due in the first quarter
+    lo, hi = parse_due_ordinal("2026-01-01"), parse_due_ordinal("2026-03-31")
+    lo_s, hi_s = "2026-01-01", "2026-03-31"
+
+    def legacy_scan():
+        return sum(hw.time_required for hw in legacy
+                   if hw.subject == "Maths" and hw.status == "Pending" and lo_s <= hw.due_date <= hi_s
+                   and isinstance(hw, LegacyTimedHomework))
+
+    def slots_scan():
+        return sum(hw.time_required for hw in slotted
+                   if hw.subject == "Maths" and hw.status == "Pending" and hw.due_ordinal is not None
+                   and lo <= hw.due_ordinal <= hi and hw.is_timed)
+
+    def column_scan():
+        sub, st = columns.subject_code("Maths"), columns.status_code("Pending")
+        return sum(m for s, c, d, m in zip(columns.subject, columns.status, columns.due, columns.minutes)
+                   if s == sub and c == st and lo <= d <= hi and m > 0)
+
+    assert legacy_scan() == slots_scan() == column_scan()
+    timed("scan: legacy objects", legacy_scan)
+    timed("scan: __slots__ objects", slots_scan)
+    timed("scan: columns", column_scan)
+    timed("count_by_status: columns", columns.count_by_status)
+    timed("ids_where(subject, status, due range): columns",
+          lambda: columns.ids_where("Maths", "Pending", lo, hi))
+
+
+def _columns(homework):
+    columns = HomeworkColumns()
+    columns.rebuild(homework)
+    return columns
+
+
+if __name__ == "__main__":
+    main()
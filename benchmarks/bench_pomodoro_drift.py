@@ -0,0 +1,97 @@
+# How far a Pomodoro countdown drifts when the event loop is busy.
+#
+# Runs a short countdown on a small after()-style event loop whose callbacks stall for a random
+# 0-300 ms (like a slow handler or a modal dialog), once with the old "decrement by one every
+# 1000 ms" loop and once with the deadline-based Timer, and reports when each reached zero.
+# Exits non-zero if the deadline timer drifts by more than one stall plus the tick slack, or
+# does no better than the decrementing loop (stalls add up over at least a few seconds).
+#
+#   python benchmarks/bench_pomodoro_drift.py [seconds]   (default 5, at least 3)
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pomodoro_engine import Timer  # noqa: E402
+
+MAX_STALL = 0.3  # seconds a callback may stall
+TICK_SLACK = 0.05  # the 5 ms added to each wait plus sleep/scheduling overshoot
+
+
+class LoadedLoop:
+    # Minimal stand-in for Tk's after() with a random stall in every callback
+    def __init__(self, seed):
+        self.rnd = random.Random(seed)
+        self.queue = []
+        self.seq = 0
+
+    def after(self, ms, callback):
+        self.seq += 1
+        heapq.heappush(self.queue, (time.monotonic() + ms / 1000, self.seq, callback))
+
+    def run(self):
+        while self.queue:
+            when, _, callback = heapq.heappop(self.queue)
+            delay = when - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            time.sleep(self.rnd.uniform(0, MAX_STALL))  # the load
+            callback()
+
+
+def run_naive(seconds, seed):
+    loop = LoadedLoop(seed)
+    state = {'left': seconds, 'end': None}
+
+    def tick():
+        if state['left'] > 0:
+            state['left'] -= 1
+            loop.after(1000, tick)
+        else:
+            state['end'] = time.monotonic()
+    start = time.monotonic()
+    tick()
+    loop.run()
+    return state['end'] - start
+
+
+def run_deadline(seconds, seed):
+    loop = LoadedLoop(seed)
+    timer = Timer(seconds)
+    state = {'end': None}
+
+    def tick():
+        wait = timer.tick()
+        if timer._remaining_time > 0:
+            loop.after(int(wait * 1000) + 5, tick)
+        else:
+            state['end'] = time.monotonic()
+    start = time.monotonic()
+    timer.start()
+    tick()
+    loop.run()
+    return state['end'] - start
+
+
+def main():
+    seconds = max(3, int(sys.argv[1]) if len(sys.argv) > 1 else 5)
+    naive = run_naive(seconds, seed=1)
+    deadline = run_deadline(seconds, seed=1)
+    print(f"{seconds} s countdown with 0-300 ms stalls per tick")
+    print(f"  decrement per tick: finished after {naive:.3f} s (drift {naive - seconds:+.3f} s)")
+    print(f"  monotonic deadline: finished after {deadline:.3f} s (drift {deadline - seconds:+.3f} s)")
+
+    failures = []
+    if deadline - seconds >= MAX_STALL + TICK_SLACK:
+        failures.append(f"deadline drift {deadline - seconds:.3f} s is not below {MAX_STALL + TICK_SLACK:.2f} s")
+    if naive <= deadline:
+        failures.append("the deadline timer did not drift less than decrementing per tick")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
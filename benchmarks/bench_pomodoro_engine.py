@@ -0,0 +1,89 @@
+# Runs the Pomodoro rules headless: thousands of simulated cycles on a fake clock.
+#
+# PomodoroEngine takes its clock and random generator as arguments, so the whole state machine
+# (phase order, long break every 4th session, skip counting, coin awards) can be driven without
+# a window or any real waiting. The main run jumps the clock straight past each phase's deadline
+# (one update() per phase), checks the phase sequence and the counts, and reports how long the
+# simulation took. A smaller run then ticks once per (late) second, as the window does, to check
+# that ticking adds up to the same focus time.
+#
+#   python benchmarks/bench_pomodoro_engine.py [cycles]   (default 10000; the ticking run uses 20)
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pomodoro_engine import PomodoroEngine  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run(cycles, seed=1, tick=False):
+    clock = FakeClock()
+    engine = PomodoroEngine(25, 5, 15, clock=clock, rng=random.Random(seed))
+    events = {'focus_time': 0, 'focus_completed': 0, 'coins_awarded': 0, 'phase_changed': 0,
+              'phase_ended': 0}
+    phases = []
+    focus_seconds = [0]
+
+    def on_event(event, data):
+        events[event] += 1
+        if event == 'focus_time':
+            focus_seconds[0] += data['seconds']
+        elif event == 'phase_changed':
+            phases.append(data['phase'])
+
+    engine.subscribe(on_event)
+    pick = random.Random(seed + 1)
+    skipped = 0
+    for _ in range(cycles * PomodoroEngine.SESSIONS_PER_CYCLE * 2):
+        if engine.is_focus and pick.random() < 0.1:
+            engine.skip()
+            skipped += 1
+            continue
+        engine.start()
+        if not tick:
+            # Wake up once, up to 2 s after the deadline
+            clock.now += engine.remaining() + pick.random() * 2
+            assert engine.update() is None
+            continue
+        while True:
+            wait = engine.update()
+            if wait is None:
+                break
+            # Tick late by up to 2 s, as a busy event loop would
+            clock.now += wait + pick.random() * 2
+
+    focus_phases = cycles * PomodoroEngine.SESSIONS_PER_CYCLE
+    assert engine.pomodoro_count == focus_phases, engine.pomodoro_count
+    assert phases.count(PomodoroEngine.LONG_BREAK) == cycles
+    assert focus_seconds[0] == (focus_phases - skipped) * 25 * 60
+    assert events['coins_awarded'] == skipped
+    assert events['phase_ended'] == events['phase_changed']
+    return events, skipped
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    started = time.perf_counter()
+    events, skipped = run(cycles)
+    elapsed = time.perf_counter() - started
+    simulated_hours = cycles * (4 * 25 + 3 * 5 + 15) / 60
+    print(f"{cycles} cycles ({simulated_hours:.0f} simulated hours, {skipped} skipped focus sessions)")
+    print(f"events: {events}")
+    print(f"took {elapsed * 1000:.0f} ms")
+
+    started = time.perf_counter()
+    run(20, tick=True)
+    print(f"20 cycles ticking every (late) second: counts match, took {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
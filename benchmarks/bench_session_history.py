@@ -0,0 +1,62 @@
+# How long the Pomodoro history takes to open after years of sessions.
+#
+# Writes a session log of N years (12 phases a day) into a temp folder, then times opening it
+# with no rollup file (every session is read) and with the rollups saved (only the sessions
+# logged after them are read), and the analytics the history window shows.
+#
+#   python benchmarks/bench_session_history.py [years]   (default 5)
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pomodoro_history import SessionLog  # noqa: E402
+
+
+def write_log(path, years, rng):
+    start = datetime.datetime(2020, 1, 1, 8)
+    with open(path, 'w') as f:
+        for day in range(years * 365):
+            at = start + datetime.timedelta(days=day)
+            for i in range(12):
+                phase = 'focus' if i % 2 == 0 else 'short_break'
+                planned = 1500 if phase == 'focus' else 300
+                skipped = rng.random() < 0.1
+                actual = rng.randint(0, planned) if skipped else planned
+                end = at + datetime.timedelta(seconds=actual)
+                f.write(json.dumps({'phase': phase, 'start': at.isoformat(timespec='seconds'),
+                                    'end': end.isoformat(timespec='seconds'), 'planned': planned,
+                                    'actual': actual, 'task': "Revise", 'outcome':
+                                    'skipped' if skipped else 'completed'}) + "\n")
+                at = end
+    return start + datetime.timedelta(days=years * 365)
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"  {label}: {(time.perf_counter() - started) * 1000:.1f} ms")
+    return result
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sessions.jsonl")
+        rollups = os.path.join(folder, "rollups.json")
+        end = write_log(path, years, random.Random(1))
+        print(f"{years} years, {years * 365 * 12} sessions, {os.path.getsize(path) // 1024} KiB log")
+        timed("open without rollups (full scan)", lambda: SessionLog(path, rollups))
+        log = timed("open with rollups", lambda: SessionLog(path, rollups))
+        log.record('focus', end, end, 1500, 1500, "Revise", False)
+        timed("open with rollups + 1 new session", lambda: SessionLog(path, rollups))
+        today = end.date()
+        timed("totals, streaks, 12 weeks", lambda: (log.totals(), log.streaks(today), log.weekly_minutes(12, today)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Latency of a Pomodoro sound cue: from asking for the sound to it starting to play.
+#
+# Compares the old way (a new thread per cue that calls pygame.mixer.init() and decodes the
+# file with mixer.music.load() every time) with SoundPlayer, which keeps the sounds decoded
+# in memory and plays them from one worker thread. Uses SDL's dummy audio driver unless
+# SDL_AUDIODRIVER is set, so it runs without a sound card.
+#
+#   python benchmarks/bench_sound_latency.py [sound file] [cues]   (default: the focus sound, 50)
+import os
+import statistics
+import sys
+import threading
+import time
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import pygame  # noqa: E402
+from pomodoro_sound import SoundPlayer  # noqa: E402
+
+
+def old_cue(path, latencies):
+    started = time.perf_counter()
+
+    def play():
+        pygame.mixer.init()
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.play()
+        latencies.append(time.perf_counter() - started)
+
+    thread = threading.Thread(target=play)
+    thread.start()
+    thread.join()
+
+
+def report(name, latencies):
+    ms = sorted(x * 1000 for x in latencies)
+    print(f"  {name}: median {statistics.median(ms):.2f} ms, worst {ms[-1]:.2f} ms")
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, "Pomodoro_defaultsound", "focus.mp3")
+    cues = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    print(f"{cues} cues of {os.path.basename(path)}")
+
+    latencies = []
+    for _ in range(cues):
+        old_cue(path, latencies)
+    pygame.mixer.music.stop()
+    report("thread + init + music.load per cue", latencies)
+
+    player = SoundPlayer()
+    player.preload(path)
+    player.flush()
+    latencies = []
+    for _ in range(cues):
+        player.play(path)
+        player.flush()
+        latencies.append(player.last_latency)
+    report("preloaded SoundPlayer", latencies)
+
+
+if __name__ == '__main__':
+    main()
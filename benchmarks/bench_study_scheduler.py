@@ -0,0 +1,65 @@
+# Full vs incremental re-plan time for the study scheduler over a semester of homework.
+#
+#   python benchmarks/bench_study_scheduler.py [homework]   (default 400)
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from homework_store import HomeworkStore, TimedHomework  # noqa: E402
+from study_scheduler import StudyScheduler  # noqa: E402
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    rnd = random.Random(7)
+    now = datetime.datetime(2026, 9, 1, 8, 0)
+    today = now.date()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HomeworkStore(os.path.join(tmp, "homework_data.json"))
+        store.load()
+        for i in range(n):
+            due = today + datetime.timedelta(days=rnd.randint(1, 120))
+            store.add(TimedHomework("Subject", f"Task {i}", "", due.isoformat(), "Pending", rnd.randint(15, 180)))
+
+        # Weekday classes for the whole semester
+        events = {}
+        for k in range(120):
+            day = today + datetime.timedelta(days=k)
+            if day.weekday() < 5:
+                events[day.isoformat()] = [
+                    {"title": "Lecture", "category": "Timetable", "time": "10:00-12:00", "startTime": "10:00", "endTime": "12:00"},
+                    {"title": "Tutorial", "category": "Timetable", "time": "14:00-16:00", "startTime": "14:00", "endTime": "16:00"},
+                ]
+        calendar_file = os.path.join(tmp, "calendar_data.json")
+        with open(calendar_file, "w") as f:
+            json.dump(events, f)
+
+        scheduler = StudyScheduler(store, calendar_file)
+        t0 = time.perf_counter()
+        scheduler.plan(now)
+        full = time.perf_counter() - t0
+        blocks = sum(len(b) for b in scheduler.blocks.values())
+        print(f"{n:,} homework, {blocks:,} blocks, {len(scheduler.unscheduled):,} don't fit")
+        print(f"full plan:                 {full * 1000:8.2f} ms")
+
+        timings = []
+        for _ in range(200):
+            hw_id = rnd.choice(list(store.items))
+            hw = store.get(hw_id)
+            due = today + datetime.timedelta(days=rnd.randint(1, 120))
+            store.replace(hw_id, TimedHomework(hw.subject, hw.title, "", due.isoformat(), "Pending", rnd.randint(15, 180)))
+            t0 = time.perf_counter()
+            scheduler.update([hw_id], now)
+            timings.append(time.perf_counter() - t0)
+        timings.sort()
+        print(f"incremental (one edit):    {timings[len(timings) // 2] * 1000:8.2f} ms median, "
+              f"{timings[-1] * 1000:.2f} ms worst")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
 import calendar
-from datetime import datetime
+from datetime import datetime, date
 import json
 import os
+from file_utils import atomic_write
+from homework_store import HomeworkStore
+from homework_due_index import DueDateIndex
 
 # =========================================================================
 # ===== Inheritance ===================================
@@ -134,6 +137,7 @@ class CalendarApp:
 
         # File for saving data (File Processing)
         self.jsonFile = "calendar_data.json"
+        self.eventsStamp = None   # (mtime, size) of the file self.events was loaded from
         self.events = self.loadEvents()   # Load saved events
 
         # Category colors (Collections: dictionary)
@@ -142,6 +146,17 @@ class CalendarApp:
             "Timetable": "#6cb287",
             "Collab": "#4eb5f0"
         }
+        self.homeworkColor = "#e1a33b"  # pending homework from the planner (read-only here)
+
+        # Homework planner data, shared with any open planner windows
+        self.homeworkFile = "homework_data.json"
+        self.homeworkStore = HomeworkStore.shared(self.homeworkFile)
+        self.loadHomework()
+        self.dueIndex = self.homeworkStore.helper(DueDateIndex)
+        self.redrawPending = None
+        self.homeworkStore.subscribe(self.onHomeworkChange)
+        self.root.bind("<Destroy>", self.onDestroy, add="+")
+        self.root.bind("<FocusIn>", self.onFocusIn, add="+")
 
         # === Top Frame (Selection for Year/Month) ===
         topFrame = tk.Frame(root, bg="#f8f9fa")
@@ -182,8 +197,16 @@ class CalendarApp:
     # === File Handling ============================================================
     # ===================================================================================
 
+    def eventsFileStamp(self):
+        try:
+            st = os.stat(self.jsonFile)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
     def loadEvents(self):
         """Load events from JSON file (File Processing + Exception Handling)"""
+        self.eventsStamp = self.eventsFileStamp()   # taken first, so a write during the read is seen later
         try:
             if os.path.exists(self.jsonFile):
                 with open(self.jsonFile, "r") as f:
@@ -192,11 +215,51 @@ class CalendarApp:
             messagebox.showerror("Error", f"Failed to load events: {e}")
         return {}
 
+    def loadHomework(self):
+        """Load the shared homework store if no planner window has yet"""
+        try:
+            if self.homeworkStore.reload_if_changed():
+                self.homeworkStore.save()  # keep IDs given to entries saved before IDs existed
+        except Exception as e:
+            print(f"Error loading homework data: {e}")
+
+    def onHomeworkChange(self, removed, added):
+        """Redraw (once, when idle) if a change touches the month on screen"""
+        if self.redrawPending:
+            return
+        year, month = self.yearVar.get(), list(calendar.month_name).index(self.monthVar.get())
+        first = date(year, month, 1).toordinal()
+        last = first + calendar.monthrange(year, month)[1] - 1
+        if any(hw.due_ordinal is not None and first <= hw.due_ordinal <= last for hw in removed + added):
+            self.redrawPending = self.root.after_idle(self.redrawForHomework)
+
+    def redrawForHomework(self):
+        self.redrawPending = None
+        self.drawCalendar()
+
+    def onDestroy(self, event):
+        if event.widget is self.root:
+            self.homeworkStore.unsubscribe(self.onHomeworkChange)
+            if self.redrawPending:
+                self.root.after_cancel(self.redrawPending)
+
+    def reloadEventsIfChanged(self):
+        """Re-read the events if the file changed since (e.g. the study planner wrote new blocks)"""
+        if self.eventsFileStamp() != self.eventsStamp:
+            self.events = self.loadEvents()
+            return True
+        return False
+
+    def onFocusIn(self, event):
+        """Show changes other windows made to the calendar file while this one was in the background"""
+        if event.widget is self.root and self.eventsFileStamp() != self.eventsStamp:
+            self.drawCalendar()
+
     def saveEvents(self):
         """Save events back to JSON file"""
         try:
-            with open(self.jsonFile, "w") as f:
-                json.dump(self.events, f, indent=2)
+            atomic_write(self.jsonFile, json.dumps(self.events, indent=2))
+            self.eventsStamp = self.eventsFileStamp()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save events: {e}")
 
@@ -206,6 +269,8 @@ class CalendarApp:
     # ===================================================================================
     def drawCalendar(self):
         """Draw the calendar grid (Loops + Selection statements)"""
+        self.reloadEventsIfChanged()
+
         # Clear old calendar
         for widget in self.calendarFrame.winfo_children():
             widget.destroy()
@@ -224,6 +289,10 @@ class CalendarApp:
         year, month = self.yearVar.get(), list(calendar.month_name).index(self.monthVar.get())
         monthCalendar = calendar.monthcalendar(year, month)
 
+        # Homework due this month, looked up by date in the due-date index
+        firstDay = date(year, month, 1).toordinal()
+        monthHomework = self.dueIndex.between(firstDay, firstDay + calendar.monthrange(year, month)[1] - 1)
+
         # Loop through weeks and days
         for row, week in enumerate(monthCalendar, start=2):
             for col, day in enumerate(week):
@@ -267,6 +336,17 @@ class CalendarApp:
                         label.bind("<Button-1>", lambda e, d=dateStr, i=idx, ev=ev:
                                    self.openEventForm(d, True, ev, i))
 
+                    # Pending homework due that day (click for the description)
+                    for hw in monthHomework.get(cellDate.toordinal(), []):
+                        if hw.status.lower() == "completed":
+                            continue
+                        label = tk.Label(frame, text=f"Due: {hw.subject} - {hw.title}",
+                                         bg=self.homeworkColor, fg="white",
+                                         font=("Segoe UI", 9), anchor="w")
+                        label.pack(fill="x", padx=2, pady=1)
+                        label.bind("<Button-1>", lambda e, hw=hw: messagebox.showinfo(
+                            f"{hw.subject}: {hw.title}", hw.description or "(No description)"))
+
                     # Click empty cell → add new event
                     frame.bind("<Button-1>", lambda e, d=dateStr: self.openEventForm(d))
 
@@ -431,9 +511,13 @@ class CalendarApp:
                 participants = [p.strip() for p in participantsStr.split(",") if p.strip()]
                 newEvent = CollabEvent(title, timeStr, participants).toDict()
 
-            # Save into events list
-            if editMode and eventIndex is not None:
-                self.events[dateStr][eventIndex] = newEvent
+            # Save into events list (re-read first, so changes made since the form opened are kept)
+            index = eventIndex
+            if self.reloadEventsIfChanged() and editMode:
+                dayEvents = self.events.get(dateStr, [])
+                index = dayEvents.index(existing) if existing in dayEvents else None
+            if editMode and index is not None:
+                self.events[dateStr][index] = newEvent
             else:
                 if dateStr not in self.events:
                     self.events[dateStr] = []
@@ -519,7 +603,15 @@ class CalendarApp:
                         (d, i, e) for (d, i, e) in eventList if e["category"] == category
                     ][index]
                     try:
-                        # Remove event from list
+                        # Remove event from list (re-read first, so changes made since are kept)
+                        if self.reloadEventsIfChanged():
+                            dayEvents = self.events.get(chosenDate, [])
+                            if ev not in dayEvents:
+                                self.drawCalendar()
+                                form.destroy()
+                                messagebox.showinfo("Deleted", "This event was already removed.")
+                                return
+                            evIndex = dayEvents.index(ev)
                         del self.events[chosenDate][evIndex]
                         if not self.events[chosenDate]:
                             del self.events[chosenDate]
@@ -0,0 +1,39 @@
+import os  # For fsync/replace
+import tempfile  # For temp files next to the target
+
+
+def write_temp(path, data):
+    # Write `data` (a string or an iterable of strings) to a fsynced temp file in the same
+    # folder as `path` and return the temp file's path; the caller moves it into place.
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            if isinstance(data, str):
+                f.write(data)
+            else:
+                f.writelines(data)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        discard_temp(tmp_path)
+        raise
+    return tmp_path
+
+
+def discard_temp(tmp_path):
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+def atomic_write(path, data):
+    # Write `data` to a temp file, fsync it and then atomically replace `path`,
+    # so readers never see a half-written file.
+    tmp_path = write_temp(path, data)
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        discard_temp(tmp_path)
+        raise
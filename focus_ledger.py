@@ -0,0 +1,75 @@
+import datetime  # For timestamping focus events
+import json  # For the JSON-lines event log
+import os    # For file existence checks
+
+LEDGER_FILE = "focus_ledger.jsonl"
+
+
+class FocusLedger:
+    # Focus time spent per homework ID, recorded by the Pomodoro timer.
+    #
+    # Every finished stretch of focus is appended to a JSON-lines file as one event and never
+    # rewritten; the running total per homework is kept in a dict, so looking it up is O(1).
+    # Loading replays the events once. Like HomeworkStore there is one shared instance per file,
+    # and subscribers get callback(hw_id) after each new event.
+    _shared = {}  # absolute path -> FocusLedger
+
+    @classmethod
+    def shared(cls, path=LEDGER_FILE):
+        key = os.path.abspath(path)
+        ledger = cls._shared.get(key)
+        if ledger is None:
+            ledger = cls._shared[key] = cls(path)
+        return ledger
+
+    def __init__(self, path=LEDGER_FILE):
+        self.path = path
+        self.totals = {}  # hw_id -> focus seconds
+        self._listeners = []
+        self._torn = False  # file ends mid-line, so the next append starts a new line first
+        self.load()
+
+    def load(self):
+        self.totals = {}
+        self._torn = False
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                self._torn = not line.endswith("\n")
+                try:
+                    event = json.loads(line)
+                    hw_id, seconds = event['hw_id'], event['seconds']
+                    self.totals[hw_id] = self.totals.get(hw_id, 0) + seconds
+                except (ValueError, KeyError, TypeError) as e:
+                    # A torn last line from a crash mid-append; the events before it are intact
+                    print(f"Skipped focus ledger line {line_no}: {e}")
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def record(self, hw_id, seconds):
+        # Append one focus event for a homework and update its running total
+        seconds = int(round(seconds))
+        if seconds <= 0:
+            return
+        event = {'hw_id': hw_id, 'seconds': seconds,
+                 'at': datetime.datetime.now().isoformat(timespec='seconds')}
+        with open(self.path, 'a') as f:
+            f.write(("\n" if self._torn else "") + json.dumps(event) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._torn = False
+        self.totals[hw_id] = self.totals.get(hw_id, 0) + seconds
+        for callback in list(self._listeners):
+            try:
+                callback(hw_id)
+            except Exception as e:
+                print(f"Error in focus ledger listener: {e}")
+
+    def minutes(self, hw_id):
+        return self.totals.get(hw_id, 0) // 60
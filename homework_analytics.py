@@ -0,0 +1,69 @@
+import datetime  # For date handling
+import numpy as np  # For vectorised group-by aggregation
+
+# Day ordinal of 1970-01-01, to turn ordinals into numpy datetime64 days
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+class HomeworkAnalytics:
+    # Workload statistics for the homework planner.
+    # Everything is aggregated with NumPy over the store's columns (no Python loop over
+    # homework objects), and the result is cached until the store changes or the day rolls over.
+    def __init__(self, store):
+        self.store = store
+        self._cache_key = None
+        self._cache = None
+
+    def stats(self, today=None):
+        today = (today or datetime.date.today()).toordinal()
+        key = (self.store.version, today)
+        if key != self._cache_key:
+            self._cache = self._compute(today)
+            self._cache_key = key
+        return self._cache
+
+    def _compute(self, today):
+        columns = self.store.columns
+        due = np.array(columns.due, dtype=np.int64)
+        minutes = np.array(columns.minutes, dtype=np.int64)
+        subject = np.array(columns.subject, dtype=np.int64)
+        status = np.array(columns.status, dtype=np.int64)
+        subject_names = list(columns.subject_names)
+
+        completed_code = columns.status_code("Completed")
+        done = status == completed_code if completed_code is not None else np.zeros(len(status), dtype=bool)
+        pending = ~done
+        dated = due != columns.NO_DATE
+
+        # Pending minutes per week (weeks start on Monday; ordinal 1 is a Monday)
+        mask = pending & dated & (minutes > 0)
+        week_start = due[mask] - (due[mask] - 1) % 7
+        weeks, inverse = np.unique(week_start, return_inverse=True)
+        week_minutes = np.bincount(inverse, weights=minutes[mask], minlength=len(weeks))
+
+        # Completion rate per subject
+        n_subjects = len(subject_names)
+        total = np.bincount(subject, minlength=n_subjects)
+        completed = np.bincount(subject[done], minlength=n_subjects)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = np.where(total > 0, completed / np.maximum(total, 1), 0.0)
+
+        # Overdue = still pending with a due date before today
+        overdue = pending & dated & (due < today)
+        overdue_by_subject = np.bincount(subject[overdue], minlength=n_subjects)
+
+        # Due-date histogram by month
+        months = (due[dated] - _EPOCH_ORDINAL).astype('datetime64[D]').astype('datetime64[M]')
+        month_values, month_counts = np.unique(months, return_counts=True)
+
+        return {
+            'pending_minutes_by_week': [
+                (datetime.date.fromordinal(int(w)), int(m)) for w, m in zip(weeks, week_minutes)],
+            'subjects': [
+                (subject_names[i], int(total[i]), int(completed[i]), float(rate[i]), int(overdue_by_subject[i]))
+                for i in np.argsort([name.casefold() for name in subject_names], kind='stable') if total[i] > 0],
+            'overdue': int(overdue.sum()),
+            'pending': int(pending.sum()),
+            'completed': int(done.sum()),
+            'due_histogram': [(str(m), int(c)) for m, c in zip(month_values, month_counts)],
+        }
@@ -0,0 +1,43 @@
+class DueDateIndex:
+    # Homework IDs grouped by due date (day ordinal), for showing homework on the calendar.
+    # Built once and then kept in step with the store's change notifications, so a month view
+    # only looks up that month's days instead of scanning every homework entry.
+    def __init__(self, store):
+        self.store = store
+        self.days = {}  # day ordinal -> set of IDs due that day
+        self._rebuild()
+        store.subscribe(self._on_change)
+
+    def _rebuild(self):
+        self.days = {}
+        for hw in self.store:
+            self._add(hw)
+
+    def _add(self, hw):
+        if hw.due_ordinal is not None:
+            self.days.setdefault(hw.due_ordinal, set()).add(hw.id)
+
+    def _discard(self, hw):
+        ids = self.days.get(hw.due_ordinal)
+        if ids is not None:
+            ids.discard(hw.id)
+            if not ids:
+                del self.days[hw.due_ordinal]
+
+    def _on_change(self, removed, added):
+        if self.store.reloading:
+            self._rebuild()
+            return
+        for hw in removed:
+            self._discard(hw)
+        for hw in added:
+            self._add(hw)
+
+    def between(self, first, last):
+        # {day ordinal: [homework, ...]} for the days first..last (inclusive) that have any
+        result = {}
+        for day in range(first, last + 1):
+            ids = self.days.get(day)
+            if ids:
+                result[day] = [self.store.get(hw_id) for hw_id in sorted(ids)]
+        return result
@@ -0,0 +1,52 @@
+class HomeworkFacets:
+    # Subject/status facets for the planner's filters: for each value, the set of homework IDs
+    # that have it. The sets follow the store's change notifications, so every add, edit or
+    # delete costs O(1), a count is len() of a set and a filter is a set lookup.
+    FIELDS = ('subject', 'status')
+
+    def __init__(self, store):
+        self.store = store
+        self.ids = {}  # field -> {value: set of IDs}
+        self._rebuild()
+        store.subscribe(self._on_change)
+
+    def _rebuild(self):
+        self.ids = {field: {} for field in self.FIELDS}
+        for hw in self.store:
+            self._add(hw)
+
+    def _add(self, hw):
+        for field in self.FIELDS:
+            self.ids[field].setdefault(getattr(hw, field), set()).add(hw.id)
+
+    def _discard(self, hw):
+        for field in self.FIELDS:
+            values = self.ids[field]
+            value = getattr(hw, field)
+            ids = values.get(value)
+            if ids is not None:
+                ids.discard(hw.id)
+                if not ids:
+                    del values[value]
+
+    def _on_change(self, removed, added):
+        if self.store.reloading:
+            self._rebuild()
+            return
+        for hw in removed:
+            self._discard(hw)
+        for hw in added:
+            self._add(hw)
+
+    def counts(self, field):
+        # [(value, count), ...] in alphabetical order
+        return sorted(((value, len(ids)) for value, ids in self.ids[field].items()),
+            key=lambda item: item[0].casefold())
+
+    def matching(self, **chosen):
+        # IDs having every chosen value (e.g. subject="English"), or None if nothing is chosen
+        sets = [self.ids[field].get(value, set()) for field, value in chosen.items() if value is not None]
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
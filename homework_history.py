@@ -0,0 +1,104 @@
+import collections  # For the bounded undo stack
+import sys   # For estimating the size of stored strings
+
+HISTORY_BUDGET_BYTES = 16 * 1024 * 1024
+_ENTRY_OVERHEAD = 200  # rough size of a Homework object and its list slots, without the strings
+
+
+class HomeworkChange:
+    # One undoable change, stored as a diff: the entries it took out of the store and the ones
+    # it put in. Unchanged entries are never copied, so the cost is proportional to the change.
+    __slots__ = ('removed', 'added', 'size')
+
+    def __init__(self, removed, added):
+        self.removed = removed
+        self.added = added
+        self.size = sum(_homework_size(hw) for hw in removed) + _ENTRY_OVERHEAD * len(added)
+
+
+def _homework_size(hw):
+    # Reading the description also pulls a lazy one into memory, which removed entries need:
+    # compaction rewrites the snapshot without them
+    size = _ENTRY_OVERHEAD + sys.getsizeof(hw.title)
+    description = hw.description
+    if description:
+        size += sys.getsizeof(description)
+    return size
+
+
+class HomeworkHistory:
+    # Undo/redo for every change made to a HomeworkStore.
+    #
+    # The history subscribes to the store, so adds, edits, deletes and imports from any planner
+    # window are recorded without the callers doing anything. Undo and redo swap a change's
+    # `removed` and `added` back through HomeworkStore.apply_changes, keeping the original IDs.
+    # The oldest entries are dropped once the stacks use more than `budget_bytes`.
+    def __init__(self, store, budget_bytes=HISTORY_BUDGET_BYTES):
+        self.store = store
+        self.budget_bytes = budget_bytes
+        self._undo = collections.deque()
+        self._redo = collections.deque()
+        self._size = 0
+        self._applying = False
+        self._generation = store.generation
+        store.subscribe(self._on_change)
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+
+    def _drop_if_reloaded(self):
+        # After a load from disk the old diffs no longer line up with the store
+        if self.store.generation != self._generation:
+            self._generation = self.store.generation
+            self.clear()
+
+    def _on_change(self, removed, added):
+        if self._applying:
+            return
+        self._drop_if_reloaded()
+        if self.store.reloading:
+            return
+        change = HomeworkChange(list(removed), list(added))
+        for old in self._redo:
+            self._size -= old.size
+        self._redo.clear()
+        self._undo.append(change)
+        self._size += change.size
+        # Evict from the oldest end; the latest change stays undoable even on its own over budget
+        while self._size > self.budget_bytes and len(self._undo) > 1:
+            self._size -= self._undo.popleft().size
+
+    def _swap(self, source, target):
+        change = source.pop()
+        self._applying = True
+        try:
+            self.store.apply_changes([hw.id for hw in change.added], change.removed)
+        finally:
+            self._applying = False
+        inverse = HomeworkChange(change.added, change.removed)
+        self._size += inverse.size - change.size
+        target.append(inverse)
+        # IDs touched, so the caller can save and re-plan just those
+        return {hw.id for hw in change.added} | {hw.id for hw in change.removed}
+
+    def undo(self):
+        self._drop_if_reloaded()
+        if not self._undo:
+            return set()
+        return self._swap(self._undo, self._redo)
+
+    def redo(self):
+        self._drop_if_reloaded()
+        if not self._redo:
+            return set()
+        return self._swap(self._redo, self._undo)
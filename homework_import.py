@@ -0,0 +1,167 @@
+import csv  # For reading syllabus spreadsheets
+import datetime  # For date handling
+import json  # For reading JSON syllabus files
+import numpy as np  # For validating a whole batch of rows at once
+from homework_store import Homework, TimedHomework
+
+# Day ordinal of 1970-01-01, to turn numpy datetime64 days into date ordinals
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+_DIGIT_POSITIONS = [0, 1, 2, 3, 5, 6, 8, 9]  # of "YYYY-MM-DD"
+_STATUSES = {"pending": "Pending", "completed": "Completed"}
+
+BATCH_ROWS = 5000  # rows validated per NumPy pass; keeps memory flat for huge files
+
+
+class ImportResult:
+    def __init__(self):
+        self.added_ids = []
+        self.duplicates = 0
+        self.errors = []  # (row/line number, message)
+
+
+def iter_import_rows(path, errors):
+    # Yield (row number, record dict) from a CSV file (with a header row) or a JSON file
+    # (a list of objects, or one object per line), streaming rather than reading it all in
+    if path.lower().endswith(".csv"):
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+        return
+    with open(path, 'rb') as f:
+        for line_no, line in enumerate(f, 1):
+            text = line.strip().rstrip(b',')
+            if text in (b'', b'[', b']', b'[]'):
+                continue
+            if text in (b'{', b'[{'):
+                # Pretty-printed JSON has no record-per-line layout, so it is parsed in one go
+                f.seek(0)
+                try:
+                    data = json.load(f)
+                except ValueError as e:
+                    errors.append((getattr(e, 'lineno', line_no), getattr(e, 'msg', str(e))))
+                    return
+                for i, item in enumerate(data if isinstance(data, list) else [data], 1):
+                    yield i, item
+                return
+            # The list's brackets may share a line with the first/last record
+            bare = text.lstrip(b'[').rstrip(b']').strip().rstrip(b',')
+            for candidate in (text, bare):
+                try:
+                    record = json.loads(candidate)
+                    break
+                except ValueError as e:
+                    error = getattr(e, 'msg', str(e))
+            else:
+                errors.append((line_no, error))
+                continue
+            for item in record if isinstance(record, list) else [record]:
+                yield line_no, item
+
+
+def _text(record, key):
+    value = record.get(key)
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def validate_batch(records, today):
+    # Check every row of a batch at once. Returns (due ordinals, minutes, statuses, problems)
+    # where problems[i] is a list of messages for row i (empty if the row is fine);
+    # minutes[i] is -1 for untimed homework.
+    n = len(records)
+    problems = [[] for _ in range(n)]
+
+    # Due dates: strict YYYY-MM-DD, decoded from the code points of the characters
+    raw_due = np.array([_text(r, 'due_date') for r in records], dtype=str)
+    right_length = np.char.str_len(raw_due) == 10
+    codes = raw_due.astype('U10').view(np.uint32).reshape(n, 10).astype(np.int64)
+    digits = codes[:, _DIGIT_POSITIONS] - 48
+    well_formed = (right_length & ((digits >= 0) & (digits <= 9)).all(axis=1)
+        & (codes[:, 4] == 45) & (codes[:, 7] == 45))
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = _DAYS_IN_MONTH[np.clip(month, 1, 12) - 1] + ((month == 2) & leap)
+    valid_date = well_formed & (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+    due = np.full(n, -1, dtype=np.int64)
+    due[valid_date] = raw_due[valid_date].astype('datetime64[D]').astype(np.int64) + _EPOCH_ORDINAL
+    past = valid_date & (due < today)
+
+    # Time required: blank means untimed, otherwise a whole number of minutes in ASCII digits
+    # (decoded from code points like the dates; str.isdigit would also accept e.g. '²')
+    raw_minutes = np.array([_text(r, 'time_required') for r in records], dtype=str)
+    lengths = np.char.str_len(raw_minutes)
+    timed = lengths > 0
+    minute_digits = raw_minutes.astype('U6').view(np.uint32).reshape(n, 6).astype(np.int64) - 48
+    in_value = np.arange(6) < lengths[:, None]
+    all_digits = (~in_value | ((minute_digits >= 0) & (minute_digits <= 9))).all(axis=1)
+    valid_minutes = ~timed | (all_digits & (lengths <= 6))
+    minutes = np.full(n, -1, dtype=np.int64)
+    use = timed & valid_minutes
+    place = 10 ** np.clip(lengths[:, None] - 1 - np.arange(6), 0, None)
+    minutes[use] = (np.where(in_value, minute_digits, 0) * place).sum(axis=1)[use]
+
+    statuses = []
+    for i in np.flatnonzero(~valid_date):
+        problems[i].append(f"due date '{raw_due[i]}' must be a valid YYYY-MM-DD date")
+    for i in np.flatnonzero(past):
+        problems[i].append(f"due date {raw_due[i]} is in the past")
+    for i in np.flatnonzero(~valid_minutes):
+        problems[i].append(f"time required '{raw_minutes[i]}' must be a whole number of minutes")
+    for i, record in enumerate(records):
+        status = _text(record, 'status')
+        canonical = _STATUSES.get(status.casefold(), "Pending" if not status else None)
+        if canonical is None:
+            problems[i].append(f"status '{status}' must be Pending or Completed")
+        statuses.append(canonical)
+    return due, minutes, statuses, problems
+
+
+def import_homework(store, path, today=None):
+    # Validate and add every homework in `path` to the store in one batch.
+    # Rows matching an existing entry (or an earlier row) on subject, title and due date are
+    # skipped as duplicates. Nothing is saved here: the caller saves once afterwards.
+    today = (today or datetime.date.today()).toordinal()
+    result = ImportResult()
+    # Hash index of what is already there, so each duplicate check is one set lookup
+    seen = {(hw.subject.casefold(), hw.title.casefold(), hw.due_ordinal) for hw in store}
+    new = []
+
+    def flush(batch):
+        due, minutes, statuses, problems = validate_batch([record for _, record in batch], today)
+        for i, (row_no, record) in enumerate(batch):
+            if problems[i]:
+                result.errors.append((row_no, "; ".join(problems[i])))
+                continue
+            subject = _text(record, 'subject')
+            title = _text(record, 'title')
+            key = (subject.casefold(), title.casefold(), int(due[i]))
+            if key in seen:
+                result.duplicates += 1
+                continue
+            seen.add(key)
+            due_date = datetime.date.fromordinal(int(due[i])).isoformat()
+            description = _text(record, 'description')
+            if minutes[i] >= 0:
+                new.append(TimedHomework(subject, title, description, due_date, statuses[i], int(minutes[i])))
+            else:
+                new.append(Homework(subject, title, description, due_date, statuses[i]))
+
+    batch = []
+    for row_no, record in iter_import_rows(path, result.errors):
+        if not isinstance(record, dict):
+            result.errors.append((row_no, "row is not an object"))
+            continue
+        batch.append((row_no, record))
+        if len(batch) >= BATCH_ROWS:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    result.errors.sort(key=lambda error: error[0])
+    result.added_ids = store.add_many(new)
+    return result
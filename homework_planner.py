@@ -1,124 +1,41 @@
-import json  # For saving/loading homework data
-import os    # For file existence checks
 import datetime  # For date handling
+import queue  # For reading errors reported by the store's writer thread
 import tkinter as tk  # GUI library
-from tkinter import ttk, messagebox  # For themed widgets and dialogs
+from tkinter import ttk, messagebox, filedialog  # For themed widgets and dialogs
 from tkinter.font import Font  # For font customization
-
-class Homework:
-    def __init__(self, subject, title, description, due_date, status):
-        # Access is controlled using property getters and setters.
-        self.__subject = subject
-        self.__title = title
-        self.__description = description
-        self.__due_date = due_date
-        self.__status = status
-
-    # subject
-    @property
-    def subject(self):
-        return self.__subject
-
-    @subject.setter
-    def subject(self, value):
-        self.__subject = value
-
-    # title
-    @property
-    def title(self):
-        return self.__title
-
-    @title.setter
-    def title(self, value):
-        self.__title = value
-
-    # description
-    @property
-    def description(self):
-        return self.__description
-
-    @description.setter
-    def description(self, value):
-        self.__description = value
-
-    # due_date
-    @property
-    def due_date(self):
-        return self.__due_date
-
-    @due_date.setter
-    def due_date(self, value):
-        self.__due_date = value
-
-    # status
-    @property
-    def status(self):
-        return self.__status
-
-    @status.setter
-    def status(self, value):
-        self.__status = value
-
-    def to_dict(self):
-        return {
-            'subject': self.__subject,
-            'title': self.__title,
-            'description': self.__description,
-            'due_date': self.__due_date,
-            'status': self.__status
-        }
-
-    @classmethod
-    def from_dict(cls, d):
-        return cls(d['subject'], d['title'], d['description'], d['due_date'], d['status'])
-
-
-class TimedHomework(Homework):
-    def __init__(self, subject, title, description, due_date, status, time_required):
-        super().__init__(subject, title, description, due_date, status)
-        self.__time_required = time_required
-
-    # time_required
-    @property
-    def time_required(self):
-        return self.__time_required
-
-    @time_required.setter
-    def time_required(self, value):
-        self.__time_required = value
-    
-    def to_dict(self):
-        d = super().to_dict()
-        d['time_required'] = self.__time_required
-        d['timed'] = True
-        return d
-
-    @classmethod
-    def from_dict(cls, d):
-        return cls(
-            d['subject'],
-            d['title'],
-            d['description'],
-            d['due_date'],
-            d['status'],
-            d.get('time_required', 0)
-        )
+from homework_store import Homework, TimedHomework, HomeworkStore, SORT_KEYS  # Homework data layer
+from study_scheduler import StudyScheduler  # For packing timed homework into free calendar time
+from homework_history import HomeworkHistory  # For undo/redo
+from homework_urgency import UrgencyQueue  # For the "Next up" panel
+from homework_facets import HomeworkFacets  # For the subject/status filters
+from focus_ledger import FocusLedger  # For focus time recorded by the Pomodoro timer
 
 class HomeworkPlannerApp:
 	HOMEWORK_FILE = "homework_data.json"
+	NEXT_UP_COUNT = 5
 
 	def __init__(self, master=None):
 		self.master = master
-		self.homework_list = []
-		self.checked_rows = set()
-		self.selected_edit_row = {'idx': None}
+		# Every planner window works on the same store, so they never overwrite each other's saves
+		self.store = HomeworkStore.shared(self.HOMEWORK_FILE)
+		self.checked_rows = set()  # homework IDs ticked for deletion
+		self.selected_edit_row = {'id': None}
+		# Active sort as [(column, ascending), ...]; the first entry is the primary column
+		self.sort_spec = []
+		self.load_warning = None  # shown once when the planner window opens
+		self.scheduler = self.store.helper(StudyScheduler)
+		self.history = self.store.helper(HomeworkHistory)  # shared, so any window can undo any change
+		self.urgency = self.store.helper(UrgencyQueue)
+		self.facets = self.store.helper(HomeworkFacets)
+		self.facet_filter = {'subject': None, 'status': None}  # None = all values
+		self.ledger = FocusLedger.shared()
 		self.load_homework_data()
 
 	def open_homework_planner_window(self):
 		# Create the homework planner window
 		hw_win = tk.Toplevel(self.master) if self.master else tk.Toplevel()
 		hw_win.title("Homework Planner")
-		hw_win.geometry("800x450")
+		hw_win.geometry("860x560")
 		tk.Label(hw_win, text="Homework Planner", font=("Segoe UI", 16, "bold")).pack(pady=10)
 
 		# Search bar
@@ -129,8 +46,37 @@ class HomeworkPlannerApp:
 		search_entry = tk.Entry(search_frame, textvariable=search_var)
 		search_entry.pack(side='left', fill='x', expand=True, padx=(5, 0))
 
+		# Subject/status filters with live counts
+		facet_frame = tk.Frame(hw_win)
+		facet_frame.pack(fill='x', padx=10, pady=(0, 5))
+		facet_boxes = {}
+		facet_choices = {}  # field -> [value shown at each combobox index]
+		def on_facet(field):
+			self.facet_filter[field] = facet_choices[field][facet_boxes[field].current()]
+			self.refresh_homework(tree, search_var.get())
+		for field, text in (('subject', "Subject:"), ('status', "Status:")):
+			tk.Label(facet_frame, text=text).pack(side='left', padx=(10 if facet_boxes else 0, 0))
+			box = ttk.Combobox(facet_frame, state='readonly', width=24)
+			box.pack(side='left', padx=(5, 0))
+			box.bind("<<ComboboxSelected>>", lambda event, field=field: on_facet(field))
+			facet_boxes[field] = box
+		def update_facets():
+			for field, box in facet_boxes.items():
+				counts = self.facets.counts(field)
+				if self.facet_filter[field] not in {value for value, _ in counts}:
+					self.facet_filter[field] = None  # its last entry is gone
+				facet_choices[field] = [None] + [value for value, _ in counts]
+				box['values'] = [f"All ({len(self.store)})"] + [f"{value} ({count})" for value, count in counts]
+				box.current(facet_choices[field].index(self.facet_filter[field]))
+
+		# The most urgent pending homework
+		next_frame = tk.LabelFrame(hw_win, text="Next up")
+		next_frame.pack(fill='x', padx=10, pady=(0, 5))
+		next_label = tk.Label(next_frame, justify='left', anchor='w')
+		next_label.pack(fill='x', padx=5)
+
 		# Table columns
-		columns = ("Select", "Subject", "Title", "Due Date", "Status", "Time Required")
+		columns = ("Select", "Subject", "Title", "Due Date", "Status", "Time Required", "Actual")
 		tree = ttk.Treeview(hw_win, columns=columns, show='headings', selectmode='none')
 		tree.heading("Select", text="☐", anchor='center')
 		tree.column("Select", width=40, anchor='center', stretch=False)
@@ -141,60 +87,50 @@ class HomeworkPlannerApp:
 		tree.heading("Due Date", text="Due Date")
 		tree.column("Due Date", width=110, anchor='center')
 
-		# Add sorting by due date
-		self._due_date_sort_asc = True
-		def sort_by_due_date():
-			# Sort the homework list by due date (ascending/descending)
-			try:
-				self.homework_list.sort(
-					key=lambda hw: datetime.datetime.strptime(hw.due_date, "%Y-%m-%d"),
-					reverse=not self._due_date_sort_asc
-				)
-			except Exception:
-				# If any date is invalid, sort as string fallback
-				self.homework_list.sort(
-					key=lambda hw: hw.due_date,
-					reverse=not self._due_date_sort_asc
-				)
-			self._due_date_sort_asc = not self._due_date_sort_asc
-			self.refresh_homework(tree, search_var.get())
-		tree.heading("Due Date", text="Due Date", command=sort_by_due_date)
 		tree.heading("Status", text="Status")
 		tree.column("Status", width=100, anchor='center')
 		tree.heading("Time Required", text="Time Required (min)")
 		tree.column("Time Required", width=130, anchor='center')
+		tree.heading("Actual", text="Actual (min)")
+		tree.column("Actual", width=90, anchor='center')
 		tree.pack(fill='both', expand=True, padx=10, pady=10)
 
 		# Info labels
 		tk.Label(hw_win, text="Tip: Double-click a row (not the checkbox) to view its description.", fg="red").pack(pady=(0, 2))
-		tk.Label(hw_win, text="Tip: Click the 'Due Date' column title to sort by due date.", fg="blue").pack(pady=(0, 5))
+		tk.Label(hw_win, text="Tip: Click a column title to sort; Shift-click to add it as a secondary sort.", fg="blue").pack(pady=(0, 5))
 
 		# Table click handler (checkbox/select row)
 		def on_tree_click(event):
 			region = tree.identify("region", event.x, event.y)
 			col = tree.identify_column(event.x)
 			row = tree.identify_row(event.y)
-			if region == "cell":
+			if region == "heading":
+				# Sort by the clicked column (Shift adds it as a secondary column)
+				column = columns[int(col[1:]) - 1] if col else None
+				if column in SORT_KEYS:
+					self.toggle_sort(column, add=bool(event.state & 0x0001))
+					self.update_sort_headings(tree)
+					self.refresh_homework(tree, search_var.get())
+			elif region == "cell":
 				if col == "#1":
 					# Checkbox column
 					if row:
-						idx = int(row)
-						if idx in self.checked_rows:
-							self.checked_rows.remove(idx)
+						hw_id = int(row)
+						if hw_id in self.checked_rows:
+							self.checked_rows.remove(hw_id)
 						else:
-							self.checked_rows.add(idx)
+							self.checked_rows.add(hw_id)
 						self.refresh_homework(tree, search_var.get())
 				else:
 					# Select row for editing
 					if row:
-						idx = int(row)
-						self.selected_edit_row['idx'] = idx
+						self.selected_edit_row['id'] = int(row)
 						for item in tree.get_children():
 							tree.item(item, tags=())
 						tree.item(row, tags=('selected',))
 					else:
 						# Clicked empty area: unselect any row
-						self.selected_edit_row['idx'] = None
+						self.selected_edit_row['id'] = None
 						for item in tree.get_children():
 							tree.item(item, tags=())
 		tree.bind("<Button-1>", on_tree_click)
@@ -206,8 +142,7 @@ class HomeworkPlannerApp:
 			col = tree.identify_column(event.x)
 			row = tree.identify_row(event.y)
 			if region == "cell" and col != "#1" and row:
-				idx = int(row)
-				hw = self.homework_list[idx]
+				hw = self.store.get(int(row))
 				desc = hw.description if hw.description else "(No description)"
 				messagebox.showinfo("Homework Description", desc)
 		tree.bind("<Double-1>", on_tree_double_click)
@@ -218,8 +153,75 @@ class HomeworkPlannerApp:
 			self.refresh_homework(tree, search_var.get())
 		search_var.trace_add('write', on_search)
 
+		update_facets()
 		self.refresh_homework(tree)
 
+		# Redraw whenever this or another window (or a reload from disk) changes the store.
+		# A burst of changes is drawn once, when Tk is next idle.
+		redraw_pending = []
+		def redraw():
+			redraw_pending.clear()
+			update_facets()
+			self.refresh_homework(tree, search_var.get())
+			self.update_next_up(next_label)
+		def schedule_redraw():
+			if not redraw_pending:
+				redraw_pending.append(hw_win.after_idle(redraw))
+		def on_store_change(removed, added):
+			for hw in removed:
+				if hw.id not in self.store:
+					self.checked_rows.discard(hw.id)
+					if self.selected_edit_row['id'] == hw.id:
+						self.selected_edit_row['id'] = None
+			schedule_redraw()
+		self.store.subscribe(on_store_change)
+		# Focus time logged by the Pomodoro timer updates the Actual column
+		def on_focus_logged(hw_id):
+			schedule_redraw()
+		self.ledger.subscribe(on_focus_logged)
+
+		def on_focus(event):
+			# Cheap mtime/size check; only re-reads if another copy of the app saved in the meantime
+			self.load_homework_data()
+			self.show_load_warning(hw_win)
+		hw_win.bind("<FocusIn>", on_focus)
+
+		# Check once a minute so the ranking follows the date when it rolls over
+		tick_job = []
+		def tick():
+			self.update_next_up(next_label)
+			tick_job[:] = [hw_win.after(60000, tick)]
+		tick()
+
+		# Saves run on the store's writer thread; its errors are shown from here, on the Tk thread
+		poll_job = []
+		def poll_write_errors():
+			while True:
+				try:
+					error = self.store.write_errors.get_nowait()
+				except queue.Empty:
+					break
+				print(error)
+				messagebox.showerror("Save Error", error, parent=hw_win)
+			poll_job[:] = [hw_win.after(500, poll_write_errors)]
+		poll_write_errors()
+
+		def on_destroy(event):
+			if event.widget is hw_win:
+				self.store.unsubscribe(on_store_change)
+				self.ledger.unsubscribe(on_focus_logged)
+				if redraw_pending:
+					hw_win.after_cancel(redraw_pending.pop())
+				if tick_job:
+					hw_win.after_cancel(tick_job.pop())
+				if poll_job:
+					hw_win.after_cancel(poll_job.pop())
+		hw_win.bind("<Destroy>", on_destroy)
+		hw_win.bind("<Control-z>", lambda event: self.step_history(hw_win, undo=True))
+		hw_win.bind("<Control-y>", lambda event: self.step_history(hw_win, undo=False))
+
+		self.show_load_warning(hw_win)
+
 		# Button frame and style
 		btn_frame = tk.Frame(hw_win, bg="#f5f6fa")
 		btn_frame.pack(pady=10)
@@ -247,28 +249,108 @@ class HomeworkPlannerApp:
 		btn_add = ttk.Button(btn_frame, text="Add Homework", style='Modern.TButton', command=lambda: self.open_add_homework(tree))
 		btn_edit = ttk.Button(btn_frame, text="Edit Homework", style='Modern.TButton', command=lambda: self.open_edit_homework(tree))
 		btn_delete = ttk.Button(btn_frame, text="Delete Homework", style='Modern.TButton', command=lambda: self.delete_homework(tree))
+		btn_plan = ttk.Button(btn_frame, text="Plan Study Time", style='Modern.TButton', command=lambda: self.plan_study_time(tree))
+		btn_stats = ttk.Button(btn_frame, text="Statistics", style='Modern.TButton', command=self.open_stats_window)
+		btn_import = ttk.Button(btn_frame, text="Import", style='Modern.TButton', command=lambda: self.import_homework_file(hw_win))
+		btn_undo = ttk.Button(btn_frame, text="Undo", style='Modern.TButton', command=lambda: self.step_history(hw_win, undo=True))
+		btn_redo = ttk.Button(btn_frame, text="Redo", style='Modern.TButton', command=lambda: self.step_history(hw_win, undo=False))
 
-		for btn in [btn_add, btn_edit, btn_delete]:
+		for btn in [btn_add, btn_edit, btn_delete, btn_import, btn_undo, btn_redo, btn_plan, btn_stats]:
 			btn.pack(side='left', padx=5)
 
+	def toggle_sort(self, column, add=False):
+		# Update the sort spec for a heading click without touching the stored order
+		for i, (col, asc) in enumerate(self.sort_spec):
+			if col == column:
+				if add or i == 0:
+					self.sort_spec[i] = (col, not asc)
+				else:
+					self.sort_spec = [(column, True)]
+				return
+		if add:
+			self.sort_spec.append((column, True))
+		else:
+			self.sort_spec = [(column, True)]
+
+	def update_sort_headings(self, tree):
+		# Show ▲/▼ (and the priority for secondary columns) next to sorted column titles
+		titles = {"Subject": "Subject", "Due Date": "Due Date", "Status": "Status", "Time Required": "Time Required (min)"}
+		for col, title in titles.items():
+			tree.heading(col, text=title)
+		for i, (col, asc) in enumerate(self.sort_spec):
+			arrow = "▲" if asc else "▼"
+			suffix = f" {arrow}" if len(self.sort_spec) == 1 else f" {arrow}{i + 1}"
+			tree.heading(col, text=titles[col] + suffix)
+
+	@property
+	def homework_list(self):
+		# Snapshot of all homework in stored (insertion) order
+		return list(self.store)
+
+	def ordered_homework(self, ids=None):
+		# Homework in display order, limited to `ids` if given. The primary column comes straight
+		# from its sorted view; secondary columns only re-order runs that tie on the primary key.
+		if ids is not None and len(ids) * 4 < len(self.store):
+			# A narrow filter: sort just its entries (ties stay in ID order, as in the views)
+			ordered = [self.store.get(hw_id) for hw_id in sorted(ids)]
+			for col, asc in reversed(self.sort_spec):
+				ordered.sort(key=SORT_KEYS[col], reverse=not asc)
+			return ordered
+		if not self.sort_spec:
+			if ids is not None:
+				return [hw for hw in self.store if hw.id in ids]
+			return list(self.store)
+		primary, ascending = self.sort_spec[0]
+		secondary = self.sort_spec[1:]
+		ordered = []
+		for run in self.store.sorted_views[primary].runs(ascending):
+			if secondary and len(run) > 1:
+				# Stable sorts from the least to the most significant secondary column
+				for col, asc in reversed(secondary):
+					run.sort(key=SORT_KEYS[col], reverse=not asc)
+			ordered.extend(run if ids is None else [hw for hw in run if hw.id in ids])
+		return ordered
+
 	def refresh_homework(self, tree, filter_text=""):
 		# Configure tags for row colors
 		tree.tag_configure('completed', background='#b6fcb6')  # light green
 		tree.tag_configure('pending', background='#ffe066')    # golden yellow
+		tree.tag_configure('unschedulable', background='#ff9f9f')  # light red: doesn't fit before its due date
 		for row in tree.get_children():
 			tree.delete(row)
 		filter_text = filter_text.lower()
-		for idx, hw in enumerate(self.homework_list):
+		# Row iids are homework IDs, so they survive sorting and deletes
+		for hw in self.ordered_homework(self.facets.matching(**self.facet_filter)):
 			if (
 				filter_text in hw.subject.lower() or
 				filter_text in hw.title.lower()
 			):
-				checked = '☑' if idx in self.checked_rows else '☐'
+				checked = '☑' if hw.id in self.checked_rows else '☐'
 				time_required = ''
-				if isinstance(hw, TimedHomework):
+				if hw.is_timed:
 					time_required = str(hw.time_required)
 				row_tag = 'completed' if hw.status.lower() == 'completed' else 'pending'
-				tree.insert('', 'end', iid=idx, values=(checked, hw.subject, hw.title, hw.due_date, hw.status, time_required), tags=(row_tag,))
+				if hw.id in self.scheduler.unscheduled:
+					row_tag = 'unschedulable'
+				actual = self.ledger.minutes(hw.id) if hw.id in self.ledger.totals else ''
+				tree.insert('', 'end', iid=hw.id, values=(checked, hw.subject, hw.title, hw.due_date, hw.status, time_required, actual), tags=(row_tag,))
+
+	def update_next_up(self, label):
+		today = datetime.date.today().toordinal()
+		lines = []
+		for hw in self.urgency.top(self.NEXT_UP_COUNT):
+			days = hw.due_ordinal - today
+			if days < 0:
+				when = f"{-days} day(s) overdue"
+			elif days == 0:
+				when = "due today"
+			elif days == 1:
+				when = "due tomorrow"
+			else:
+				when = f"due in {days} days"
+			work = f", {hw.time_required} min" if hw.is_timed else ""
+			lines.append(f"{hw.subject}: {hw.title} ({when}{work})")
+		label.config(text="\n".join(lines) if lines else "Nothing pending.")
 
 	def open_add_homework(self, tree):
 		#Open a window to add a new homework entry.
@@ -339,18 +421,18 @@ class HomeworkPlannerApp:
 			hw = TimedHomework(subject, title, description, due_date, status, time_required)
 		else:
 			hw = Homework(subject, title, description, due_date, status)
-		self.homework_list.append(hw)
+		self.store.add(hw)  # open planner windows redraw through their store subscription
 		self.save_homework_data()
-		self.refresh_homework(tree)
+		self.replan_study_time([hw.id])
 		add_win.destroy()
 
 	def open_edit_homework(self, tree):
 		# Open a window to edit the selected homework entry.
-		idx = self.selected_edit_row.get('idx')
-		if idx is None or not isinstance(idx, int) or idx < 0 or idx >= len(self.homework_list):
+		hw_id = self.selected_edit_row.get('id')
+		hw = self.store.get(hw_id)
+		if hw is None:
 			messagebox.showwarning("No selection", "Please click a row (not the checkbox) to select a homework entry to edit.")
 			return
-		hw = self.homework_list[idx]
 
 		edit_win = tk.Toplevel(self.master) if self.master else tk.Toplevel()
 		edit_win.title("Edit Homework")
@@ -383,13 +465,13 @@ class HomeworkPlannerApp:
 		status_menu.pack(fill='x', padx=10)
 
 		# Timed homework option
-		is_timed_var = tk.BooleanVar(value=isinstance(hw, TimedHomework))
+		is_timed_var = tk.BooleanVar(value=hw.is_timed)
 		timed_frame = tk.Frame(edit_win)
 		timed_frame.pack(fill='x', padx=10, pady=(10,0))
 		tk.Checkbutton(timed_frame, text="Timed Homework (add time required)", variable=is_timed_var).pack(anchor='w')
 		time_required_label = tk.Label(edit_win, text="Time Required (minutes):")
 		time_required_entry = tk.Spinbox(edit_win, from_=1, to=1440, width=10)
-		if isinstance(hw, TimedHomework):
+		if hw.is_timed:
 			time_required_entry.delete(0, 'end')
 			time_required_entry.insert(0, hw.time_required)
 		else:
@@ -413,9 +495,9 @@ class HomeworkPlannerApp:
 		edit_win.time_required_entry = time_required_entry
 
 		tk.Button(edit_win, text="Save Changes", command=lambda: self.edit_homework(
-			idx, subject_entry.get(), title_entry.get(), desc_entry.get(), due_entry.get(), status_var.get(), tree, edit_win, is_timed_var.get(), time_required_entry.get() if is_timed_var.get() else None)).pack(pady=15)
+			hw_id, subject_entry.get(), title_entry.get(), desc_entry.get(), due_entry.get(), status_var.get(), tree, edit_win, is_timed_var.get(), time_required_entry.get() if is_timed_var.get() else None)).pack(pady=15)
 
-	def edit_homework(self, idx, subject, title, description, due_date, status, tree, edit_win, is_timed, time_required):
+	def edit_homework(self, hw_id, subject, title, description, due_date, status, tree, edit_win, is_timed, time_required):
 		# Validate due date format
 		try:
 			due_dt = datetime.datetime.strptime(due_date, "%Y-%m-%d")
@@ -432,12 +514,13 @@ class HomeworkPlannerApp:
 			except ValueError:
 				messagebox.showwarning("Input Error", "Time Required must be an integer (minutes).")
 				return
-			self.homework_list[idx] = TimedHomework(subject, title, description, due_date, status, time_required)
+			hw = TimedHomework(subject, title, description, due_date, status, time_required)
 		else:
-			self.homework_list[idx] = Homework(subject, title, description, due_date, status)
+			hw = Homework(subject, title, description, due_date, status)
+		self.store.replace(hw_id, hw)
 		self.save_homework_data()
-		self.selected_edit_row['idx'] = None
-		self.refresh_homework(tree)
+		self.replan_study_time([hw_id])
+		self.selected_edit_row['id'] = None
 		edit_win.destroy()
 
 	def delete_homework(self, tree):
@@ -450,18 +533,145 @@ class HomeworkPlannerApp:
 			msg = f"Are you sure you want to delete these {len(self.checked_rows)} homework entries?"
 		confirm = messagebox.askyesno("Confirm Delete", msg)
 		if confirm:
-			for idx in sorted(self.checked_rows, reverse=True):
-				del self.homework_list[idx]
+			removed = self.store.remove_many(self.checked_rows)
 			self.checked_rows.clear()
-			self.selected_edit_row['idx'] = None
+			self.selected_edit_row['id'] = None
+			self.save_homework_data()
+			self.replan_study_time([hw.id for hw in removed])
+
+	def step_history(self, window, undo=True):
+		# Undo/redo the most recent change made in any planner window
+		changed = self.history.undo() if undo else self.history.redo()
+		if not changed:
+			window.bell()
+			return
+		self.save_homework_data()
+		self.replan_study_time(changed)
+
+	def import_homework_file(self, parent):
+		# Bulk-add a syllabus from a CSV/JSON file with the same columns as the table
+		path = filedialog.askopenfilename(parent=parent, title="Import Homework",
+			filetypes=[("Homework files", "*.csv *.json *.jsonl"), ("All files", "*.*")])
+		if not path:
+			return
+		# Imported here so NumPy is only loaded once an import is run
+		from homework_import import import_homework
+		try:
+			result = import_homework(self.store, path)
+		except (OSError, UnicodeDecodeError) as e:
+			messagebox.showerror("Import Homework", f"Could not read {path}: {e}", parent=parent)
+			return
+		if result.added_ids:
+			# One save and one replan for the whole batch; the table redraws once via the store
 			self.save_homework_data()
-			self.refresh_homework(tree)
+			self.replan_study_time(result.added_ids)
+		msg = f"Imported {len(result.added_ids)} homework."
+		if result.duplicates:
+			msg += f"\nSkipped {result.duplicates} duplicate(s) of existing entries."
+		if result.errors:
+			lines = [f"- row {row}: {err}" for row, err in result.errors[:15]]
+			msg += f"\n\n{len(result.errors)} row(s) had errors and were skipped:\n" + "\n".join(lines)
+			if len(result.errors) > 15:
+				msg += f"\n...and {len(result.errors) - 15} more"
+			messagebox.showwarning("Import Homework", msg, parent=parent)
+		else:
+			messagebox.showinfo("Import Homework", msg, parent=parent)
+
+	def plan_study_time(self, tree):
+		# Pack pending timed homework into free calendar time and write the blocks to the calendar
+		try:
+			self.scheduler.plan()
+			self.scheduler.write_calendar()
+		except Exception as e:
+			messagebox.showerror("Study Plan", f"Could not plan study time: {e}")
+			return
+		self.refresh_homework(tree)
+		block_count = sum(len(blocks) for blocks in self.scheduler.blocks.values())
+		msg = f"Added {block_count} study block(s) for {len(self.scheduler.blocks)} homework to the calendar."
+		if self.scheduler.unscheduled:
+			lines = []
+			for hw_id, minutes in self.scheduler.unscheduled.items():
+				hw = self.store.get(hw_id)
+				lines.append(f"- {hw.subject}: {hw.title} (due {hw.due_date}, {minutes} min short)")
+			msg += "\n\nThese can't fit before their due date (shown in red):\n" + "\n".join(lines[:15])
+			if len(lines) > 15:
+				msg += f"\n...and {len(lines) - 15} more"
+		messagebox.showinfo("Study Plan", msg)
+
+	def open_stats_window(self):
+		# Workload dashboard; the numbers come from a cache that is only rebuilt after a change
+		# Imported here so NumPy is only loaded once the stats window is used
+		from homework_analytics import HomeworkAnalytics
+		stats = self.store.helper(HomeworkAnalytics).stats()
+
+		stats_win = tk.Toplevel(self.master) if self.master else tk.Toplevel()
+		stats_win.title("Homework Statistics")
+		stats_win.geometry("640x620")
+		tk.Label(stats_win, text="Homework Statistics", font=("Segoe UI", 16, "bold")).pack(pady=10)
+		tk.Label(stats_win, text=f"Pending: {stats['pending']}    Completed: {stats['completed']}    Overdue: {stats['overdue']}",
+			font=("Segoe UI", 11), fg="#d63031" if stats['overdue'] else "black").pack()
+
+		# Pending minutes for this week and the following ones
+		this_week = datetime.date.today() - datetime.timedelta(days=datetime.date.today().weekday())
+		weeks = [(week, minutes) for week, minutes in stats['pending_minutes_by_week'] if week >= this_week][:12]
+		tk.Label(stats_win, text="Pending minutes per week", font=("Segoe UI", 10, "bold")).pack(pady=(10, 0))
+		week_canvas = tk.Canvas(stats_win, width=600, height=130, bg="white", highlightthickness=0)
+		week_canvas.pack()
+		self.draw_bar_chart(week_canvas, [week.strftime("%d %b") for week, _ in weeks], [m for _, m in weeks], "#00bcd4")
+
+		# Completion rate and overdue count per subject
+		tk.Label(stats_win, text="By subject", font=("Segoe UI", 10, "bold")).pack(pady=(10, 0))
+		columns = ("Subject", "Total", "Completed", "Completion", "Overdue")
+		table = ttk.Treeview(stats_win, columns=columns, show='headings', height=6)
+		for col in columns:
+			table.heading(col, text=col)
+			table.column(col, width=110, anchor='center')
+		for subject, total, completed, rate, overdue in stats['subjects']:
+			table.insert('', 'end', values=(subject, total, completed, f"{rate:.0%}", overdue))
+		table.pack(padx=10)
+
+		# Due dates per month
+		months = stats['due_histogram'][-12:]
+		tk.Label(stats_win, text="Due dates per month", font=("Segoe UI", 10, "bold")).pack(pady=(10, 0))
+		month_canvas = tk.Canvas(stats_win, width=600, height=130, bg="white", highlightthickness=0)
+		month_canvas.pack()
+		self.draw_bar_chart(month_canvas, [month for month, _ in months], [c for _, c in months], "#40739e")
+
+	def draw_bar_chart(self, canvas, labels, values, color):
+		# Simple labelled bar chart on a canvas
+		width, height = int(canvas['width']), int(canvas['height'])
+		if not values:
+			canvas.create_text(width // 2, height // 2, text="No data", fill="#636e72")
+			return
+		top = max(values) or 1
+		slot = width / len(values)
+		bar_width = min(40, slot * 0.7)
+		for i, (label, value) in enumerate(zip(labels, values)):
+			x = slot * i + slot / 2
+			bar_height = (height - 40) * value / top
+			canvas.create_rectangle(x - bar_width / 2, height - 20 - bar_height, x + bar_width / 2, height - 20, fill=color, outline="")
+			canvas.create_text(x, height - 26 - bar_height, text=str(value), font=("Segoe UI", 8), anchor='s')
+			canvas.create_text(x, height - 10, text=label, font=("Segoe UI", 8))
+
+	def replan_study_time(self, changed_ids):
+		# Once a plan exists, keep it current by re-packing only what the change affects
+		if not self.scheduler.has_plan:
+			return
+		try:
+			self.scheduler.update(changed_ids)
+			self.scheduler.write_calendar()
+		except Exception as e:
+			print(f"Error updating study plan: {e}")
+
+	def show_load_warning(self, parent):
+		warning, self.load_warning = self.load_warning, None
+		if warning:
+			messagebox.showwarning("Homework Data", warning, parent=parent)
 
 	def save_homework_data(self):
-		# Save the homework list to a JSON file.
+		# Queue the changes for the store's writer thread; write failures arrive in poll_write_errors
 		try:
-			with open(self.HOMEWORK_FILE, 'w') as f:
-				json.dump([hw.to_dict() for hw in self.homework_list], f, indent=2)
+			self.store.save()
 			return True
 		except Exception as e:
 			print(f"Error saving homework data: {e}")
@@ -469,16 +679,28 @@ class HomeworkPlannerApp:
 			return False
 
 	def load_homework_data(self):
+		# Loads the shared store the first time; later calls only re-read it if the files changed
 		try:
-			if os.path.exists(self.HOMEWORK_FILE):
-				with open(self.HOMEWORK_FILE, 'r') as f:
-					data = json.load(f)
-					self.homework_list = [TimedHomework.from_dict(d) if d.get('timed') else Homework.from_dict(d) for d in data]
-			else:
-				self.homework_list = []
+			migrated = self.store.reload_if_changed()
 		except Exception as e:
+			# The store refuses to save after a failed load, so the file on disk is left alone
 			print(f"Error loading homework data: {e}")
-			self.homework_list = []
+			self.load_warning = f"Failed to load homework data: {e}\n\nChanges will not be saved until this is fixed."
+			return
+		if migrated is None:
+			return  # unchanged since the last load
+		for err in self.store.load_errors:
+			print(f"Skipped corrupt homework record: {err}")
+		if self.store.load_errors:
+			shown = "\n".join(self.store.load_errors[:10])
+			more = len(self.store.load_errors) - 10
+			if more > 0:
+				shown += f"\n...and {more} more"
+			self.load_warning = (f"{len(self.store.load_errors)} corrupt homework record(s) were skipped:\n{shown}\n\n"
+				"A backup of the damaged file was saved next to it (*.corrupt-<date>).")
+		if migrated:
+			# Persist the IDs given to entries saved before IDs existed
+			self.save_homework_data()
 
 
 # Run the app if this file is executed directly
@@ -0,0 +1,909 @@
+import atexit  # For flushing queued writes on exit
+import json  # For saving/loading homework data
+import os    # For file existence checks
+import sys   # For interning repeated strings
+import bisect  # For keeping sorted views ordered on insert/remove
+import collections  # For counting column codes
+import datetime  # For date handling
+import queue  # For handing writes to the writer thread
+import re  # For resynchronising after corrupt records
+import shutil  # For backing up damaged data files
+import threading  # For the background writer
+from array import array  # For compact typed columns
+from file_utils import write_temp, discard_temp  # For crash-safe snapshot writes
+
+def parse_due_ordinal(due_date):
+    # Convert a YYYY-MM-DD string to a day ordinal, or None if it is not a valid date
+    if isinstance(due_date, str) and len(due_date) == 10 and due_date[4] == due_date[7] == '-':
+        # Fast path for the zero-padded form the planner writes
+        try:
+            return datetime.date.fromisoformat(due_date).toordinal()
+        except ValueError:
+            pass
+    try:
+        return datetime.datetime.strptime(due_date, "%Y-%m-%d").toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+class SnapshotFile:
+    # Random access to records in the snapshot, used to load lazy descriptions.
+    # The lock keeps these reads apart from compaction swapping in a new file.
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self._file = None
+
+    def read_record(self, offset, length):
+        with self.lock:
+            if self._file is None:
+                self._file = open(self.path, 'rb')
+            self._file.seek(offset)
+            line = self._file.read(length)
+        return json.loads(line.strip().rstrip(b','))
+
+    def close(self):
+        # Callers that swap the file hold `lock`
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class LazyText:
+    # A description that stays in the snapshot file until it is first needed
+    __slots__ = ('source', 'offset', 'length')
+
+    def __init__(self, source, offset, length):
+        self.source = source
+        self.offset = offset
+        self.length = length
+
+    def load(self):
+        return self.source.read_record(self.offset, self.length)['description']
+
+
+class Homework:
+    # __slots__ keeps each entry to a fixed set of fields with no per-instance __dict__.
+    # A valid due date is kept only as its day ordinal (the string is rebuilt on access);
+    # time_required lives on the base class (None means untimed), so callers check
+    # `is_timed` instead of isinstance.
+    __slots__ = ('__id', '__subject', '__title', '__description', '__due', '__status', '__time_required')
+
+    def __init__(self, subject, title, description, due_date, status, hw_id=None, time_required=None):
+        # Access is controlled using property getters and setters.
+        self.__id = hw_id  # persistent ID, assigned by HomeworkStore when first stored
+        # Subjects and statuses repeat a lot, so all entries share one copy of each string
+        self.__subject = sys.intern(subject)
+        self.__title = title
+        self.__description = description
+        self.due_date = due_date
+        self.__status = sys.intern(status)
+        self.__time_required = time_required
+
+    # id
+    @property
+    def id(self):
+        return self.__id
+
+    @id.setter
+    def id(self, value):
+        self.__id = value
+
+    # subject
+    @property
+    def subject(self):
+        return self.__subject
+
+    @subject.setter
+    def subject(self, value):
+        self.__subject = sys.intern(value)
+
+    # title
+    @property
+    def title(self):
+        return self.__title
+
+    @title.setter
+    def title(self, value):
+        self.__title = value
+
+    # description (may still be on disk; it is read and kept the first time it is used)
+    @property
+    def description(self):
+        if isinstance(self.__description, LazyText):
+            try:
+                self.__description = self.__description.load()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error loading homework description: {e}")
+                return ""
+        return self.__description
+
+    @description.setter
+    def description(self, value):
+        self.__description = value
+
+    @property
+    def lazy_description(self):
+        # The on-disk reference while the description has not been loaded, else None
+        return self.__description if isinstance(self.__description, LazyText) else None
+
+    # due_date (YYYY-MM-DD; an invalid date is kept as the original string)
+    @property
+    def due_date(self):
+        due = self.__due
+        return datetime.date.fromordinal(due).isoformat() if isinstance(due, int) else due
+
+    @due_date.setter
+    def due_date(self, value):
+        ordinal = parse_due_ordinal(value)
+        self.__due = value if ordinal is None else ordinal
+
+    # due_ordinal (parsed once whenever due_date is set; None if the date is invalid)
+    @property
+    def due_ordinal(self):
+        due = self.__due
+        return due if isinstance(due, int) else None
+
+    # status
+    @property
+    def status(self):
+        return self.__status
+
+    @status.setter
+    def status(self, value):
+        self.__status = sys.intern(value)
+
+    # time_required (minutes; None for untimed homework)
+    @property
+    def time_required(self):
+        return self.__time_required
+
+    @time_required.setter
+    def time_required(self, value):
+        self.__time_required = value
+
+    @property
+    def is_timed(self):
+        return self.__time_required is not None
+
+    def to_dict(self):
+        d = {
+            'id': self.__id,
+            'subject': self.__subject,
+            'title': self.__title,
+            # Lazy descriptions are read for the copy but not kept in memory
+            'description': self.__description.load() if isinstance(self.__description, LazyText) else self.__description,
+            'due_date': self.due_date,
+            'status': self.__status
+        }
+        if self.__time_required is not None:
+            d['time_required'] = self.__time_required
+            d['timed'] = True
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['subject'], d['title'], d.get('description', ''), d['due_date'], d['status'], d.get('id'))
+
+
+class TimedHomework(Homework):
+    # Homework that always has a time_required estimate
+    __slots__ = ()
+
+    def __init__(self, subject, title, description, due_date, status, time_required, hw_id=None):
+        super().__init__(subject, title, description, due_date, status, hw_id, time_required)
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d['subject'],
+            d['title'],
+            d.get('description', ''),
+            d['due_date'],
+            d['status'],
+            d.get('time_required', 0),
+            d.get('id')
+        )
+
+
+class HomeworkColumns:
+    # Column-oriented copy of the fields that filters and aggregates scan: typed arrays of
+    # IDs, due-date ordinals and minutes, plus subject/status codes into interned name tables.
+    # Rows stay packed (a delete moves the last row into the hole), so scans are tight loops
+    # over arrays rather than property lookups on Homework objects.
+    NO_DATE = -1  # due value for an invalid date
+    UNTIMED = -1  # minutes value for homework without time_required
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def clear(self):
+        self.ids = array('q')
+        self.due = array('i')
+        self.minutes = array('i')
+        self.subject = array('i')
+        self.status = array('i')
+        self.row_of = {}  # id -> row
+        self.subject_names = []
+        self.status_names = []
+        self._subject_codes = {}
+        self._status_codes = {}
+
+    def rebuild(self, homework):
+        self.clear()
+        for hw in homework:
+            self.append(hw)
+
+    @staticmethod
+    def _code(names, codes, value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+
+    def subject_code(self, subject):
+        return self._subject_codes.get(subject)
+
+    def status_code(self, status):
+        return self._status_codes.get(status)
+
+    def _values(self, hw):
+        return (
+            self.NO_DATE if hw.due_ordinal is None else hw.due_ordinal,
+            self.UNTIMED if hw.time_required is None else int(hw.time_required),
+            self._code(self.subject_names, self._subject_codes, hw.subject),
+            self._code(self.status_names, self._status_codes, hw.status),
+        )
+
+    def append(self, hw):
+        due, minutes, subject, status = self._values(hw)
+        self.row_of[hw.id] = len(self.ids)
+        self.ids.append(hw.id)
+        self.due.append(due)
+        self.minutes.append(minutes)
+        self.subject.append(subject)
+        self.status.append(status)
+
+    def update(self, hw):
+        row = self.row_of[hw.id]
+        self.due[row], self.minutes[row], self.subject[row], self.status[row] = self._values(hw)
+
+    def remove(self, hw_id):
+        row = self.row_of.pop(hw_id)
+        last = len(self.ids) - 1
+        columns = (self.ids, self.due, self.minutes, self.subject, self.status)
+        if row != last:
+            for col in columns:
+                col[row] = col[last]
+            self.row_of[self.ids[row]] = row
+        for col in columns:
+            col.pop()
+
+    def ids_where(self, subject=None, status=None, due_from=None, due_to=None):
+        # IDs matching every given filter; due_from/due_to are inclusive ordinals
+        subject_code = status_code = None
+        if subject is not None:
+            subject_code = self.subject_code(subject)
+            if subject_code is None:
+                return []
+        if status is not None:
+            status_code = self.status_code(status)
+            if status_code is None:
+                return []
+        # Invalid dates (NO_DATE) only match when no date range is given
+        check_due = due_from is not None or due_to is not None
+        lo = 1 if due_from is None else due_from
+        hi = datetime.date.max.toordinal() if due_to is None else due_to
+        result = []
+        for hw_id, sub, st, due in zip(self.ids, self.subject, self.status, self.due):
+            if subject_code is not None and sub != subject_code:
+                continue
+            if status_code is not None and st != status_code:
+                continue
+            if check_due and not lo <= due <= hi:
+                continue
+            result.append(hw_id)
+        return result
+
+    def count_by_status(self):
+        counts = collections.Counter(self.status)
+        return {self.status_names[code]: n for code, n in counts.items()}
+
+    def count_by_subject(self):
+        counts = collections.Counter(self.subject)
+        return {self.subject_names[code]: n for code, n in counts.items()}
+
+    def total_minutes(self, status=None):
+        # Sum of time_required over timed entries, optionally only those with `status`
+        if status is None:
+            return sum(m for m in self.minutes if m > 0)
+        code = self.status_code(status)
+        if code is None:
+            return 0
+        return sum(m for st, m in zip(self.status, self.minutes) if st == code and m > 0)
+
+
+class SortedView:
+    # Keeps homework ordered by one column; inserts/removes use bisect instead of re-sorting
+    def __init__(self, key):
+        self.key = key
+        self._keys = []   # (sort key, id) pairs in ascending order
+        self._items = []  # homework objects, parallel to _keys
+
+    def __len__(self):
+        return len(self._items)
+
+    def rebuild(self, homework):
+        pairs = sorted(((self.key(hw), hw.id), hw) for hw in homework)
+        self._keys = [k for k, _ in pairs]
+        self._items = [hw for _, hw in pairs]
+
+    def insert(self, hw):
+        entry = (self.key(hw), hw.id)
+        i = bisect.bisect_right(self._keys, entry)
+        self._keys.insert(i, entry)
+        self._items.insert(i, hw)
+
+    def insert_many(self, homework):
+        # Merge a batch in with one sort; timsort merges the two already-sorted runs in linear time
+        pairs = sorted(list(zip(self._keys, self._items)) + [((self.key(hw), hw.id), hw) for hw in homework])
+        self._keys = [k for k, _ in pairs]
+        self._items = [hw for _, hw in pairs]
+
+    def remove(self, hw):
+        entry = (self.key(hw), hw.id)
+        i = bisect.bisect_left(self._keys, entry)
+        if i < len(self._keys) and self._keys[i] == entry:
+            del self._keys[i]
+            del self._items[i]
+
+    def discard_many(self, ids):
+        # Drop every entry whose ID is in `ids` in one pass over the view
+        keep = [i for i, (_, hw_id) in enumerate(self._keys) if hw_id not in ids]
+        self._keys = [self._keys[i] for i in keep]
+        self._items = [self._items[i] for i in keep]
+
+    def runs(self, ascending=True):
+        # Yield lists of entries that share the same key, in key order.
+        # Entries inside a run always stay in ID (creation) order, so descending order is stable too.
+        bounds = []
+        start = 0
+        keys = self._keys
+        for i in range(1, len(keys) + 1):
+            if i == len(keys) or keys[i][0] != keys[start][0]:
+                bounds.append((start, i))
+                start = i
+        if not ascending:
+            bounds.reverse()
+        for i, j in bounds:
+            yield self._items[i:j]
+
+
+def due_date_sort_key(hw):
+    # Invalid dates sort after every valid date
+    return (hw.due_ordinal is None, hw.due_ordinal or 0)
+
+
+def time_required_sort_key(hw):
+    # Untimed homework sorts before any timed homework
+    return hw.time_required if hw.is_timed else -1
+
+
+# Sortable table columns and the key each sorted view is ordered by
+SORT_KEYS = {
+    "Subject": lambda hw: hw.subject.casefold(),
+    "Due Date": due_date_sort_key,
+    "Status": lambda hw: hw.status.casefold(),
+    "Time Required": time_required_sort_key,
+}
+
+
+# Descriptions shorter than this are cheaper to keep in memory than to reference on disk
+LAZY_DESCRIPTION_CHARS = 64
+
+# Where the next record starts in a pretty-printed (legacy) snapshot
+_LEGACY_RECORD_START = re.compile(r'\n\s*\{')
+
+
+def stored_minutes(value):
+    # time_required of a stored record as whole minutes, None if it is missing. Older files may
+    # hold floats like 30.0 or digit strings; anything that is not a whole number is rejected.
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError("invalid 'time_required'")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().isascii() and value.strip().isdigit():
+        return int(value)
+    raise ValueError("invalid 'time_required'")
+
+
+def homework_from_dict(d):
+    # Build a Homework/TimedHomework from a stored record, rejecting malformed ones
+    if not isinstance(d, dict):
+        raise ValueError("record is not an object")
+    for key in ('subject', 'title', 'due_date', 'status'):
+        if not isinstance(d.get(key), str):
+            raise ValueError(f"missing or invalid '{key}'")
+    if not isinstance(d.get('description', ''), str):
+        raise ValueError("invalid 'description'")
+    hw_id = d.get('id')
+    if hw_id is not None and (not isinstance(hw_id, int) or isinstance(hw_id, bool)):
+        raise ValueError("invalid 'id'")
+    if d.get('timed'):
+        minutes = stored_minutes(d.get('time_required', 0))
+        if minutes is None:  # a timed record without an estimate loads as untimed
+            return Homework.from_dict(d)
+        return TimedHomework.from_dict(dict(d, time_required=minutes))
+    return Homework.from_dict(d)
+
+
+def iter_snapshot(path, errors):
+    # Yield (record, line_no, offset, length) for each record of a snapshot, one line at a time,
+    # so memory stays flat however big the file is. Corrupt records are skipped and described
+    # in `errors`. Pretty-printed snapshots from older versions go through a tolerant scanner
+    # instead (their offsets are None, so their descriptions are not lazy).
+    name = os.path.basename(path)
+    with open(path, 'rb') as f:
+        offset = 0
+        for line_no, line in enumerate(f, 1):
+            start = offset
+            offset += len(line)
+            text = line.strip().rstrip(b',')
+            if text in (b'', b'[', b']', b'[]'):
+                continue
+            if text == b'{':
+                f.seek(0)
+                yield from _scan_legacy_snapshot(f.read().decode('utf-8', errors='replace'), name, errors)
+                return
+            try:
+                record = json.loads(text)
+            except ValueError as e:
+                errors.append(f"{name} line {line_no}: {getattr(e, 'msg', e)}")
+                continue
+            yield record, line_no, start, len(line)
+
+
+def _scan_legacy_snapshot(text, name, errors):
+    decoder = json.JSONDecoder()
+    pos = text.find('{')
+    while pos != -1:
+        try:
+            record, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError as e:
+            errors.append(f"{name} line {e.lineno}: {e.msg}")
+            # Resynchronise at the next record that starts on its own line
+            match = _LEGACY_RECORD_START.search(text, pos + 1)
+            pos = text.index('{', match.start()) if match else -1
+            continue
+        yield record, text.count('\n', 0, pos) + 1, None, None
+        pos = text.find('{', end)
+
+
+class HomeworkStore:
+    # All homework entries keyed by a persistent integer ID.
+    # Lookups and edits are O(1) dict operations; sorted views are kept in sync on every change.
+    #
+    # On disk the store is log-structured: `path` holds the last snapshot (a JSON list, one
+    # record per line) and every mutation since then is appended to a JSON-lines log.
+    # Loading replays the log on top of the snapshot. All writing happens on one background
+    # writer thread: save() only queues the new log lines, the thread appends a burst of them
+    # with a single fsync and, once the log grows past LOG_COMPACT_BYTES, folds it into a new,
+    # atomically replaced snapshot. Write failures come back through `write_errors`.
+    #
+    # Windows share one store per file through shared(): it is loaded once and only re-read
+    # when the files' mtime/size change behind its back, and every change is pushed to the
+    # subscribed callbacks as callback(removed, added) with lists of Homework objects.
+    LOG_COMPACT_BYTES = 64 * 1024
+    _shared = {}  # absolute path -> HomeworkStore
+
+    @classmethod
+    def shared(cls, path):
+        # The process-wide store for `path` (not loaded yet the first time; see reload_if_changed)
+        key = os.path.abspath(path)
+        store = cls._shared.get(key)
+        if store is None:
+            store = cls._shared[key] = cls(path)
+        return store
+
+    def __init__(self, path):
+        self.path = path
+        self.log_path = os.path.splitext(path)[0] + ".log.jsonl"
+        self.compacting_path = self.log_path + ".compacting"
+        self.items = {}  # id -> Homework, in insertion order
+        self.next_id = 1
+        self.sorted_views = {col: SortedView(key) for col, key in SORT_KEYS.items()}
+        self.columns = HomeworkColumns()  # packed copy of the scanned fields, for filters/aggregates
+        self.version = 0  # bumped on every change, so derived caches know when they are stale
+        self.generation = 0  # bumped by every load, so listeners know older changes are void
+        self.reloading = False  # True while listeners are told about a reload from disk
+        self._pending = []  # log records not yet appended to disk
+        self._needs_compaction = False
+        self._log_bytes = 0  # log size including queued appends, to decide when to compact
+        self._jobs = queue.Queue()  # ('append', text) / ('compact', homework, next_id, source)
+        self._writer = None
+        self._unwritten = []  # log text whose append failed; retried with the next one
+        self.write_errors = queue.Queue()  # messages from the writer thread, for the UI to show
+        self._snapshot = None  # SnapshotFile that lazy descriptions are read from
+        self.load_errors = []  # descriptions of corrupt records skipped by the last load
+        self.load_failed = False
+        self.loaded = False
+        self._listeners = []
+        self._helpers = {}  # factory -> derived object (scheduler, analytics, ...) kept per store
+        self._io_lock = threading.Lock()  # file writes and the stamp of them are taken together
+        self._stamp = None  # file_stamp() after our own last write
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+    def __contains__(self, hw_id):
+        return hw_id in self.items
+
+    def get(self, hw_id):
+        return self.items.get(hw_id)
+
+    # ----- Sharing between windows -----
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, removed, added):
+        for callback in list(self._listeners):
+            try:
+                callback(removed, added)
+            except Exception as e:
+                # One broken window must not stop the others from being updated
+                print(f"Error in homework change listener: {e}")
+
+    def helper(self, factory):
+        # One instance of factory(store) per store, so every window uses the same scheduler/caches
+        helper = self._helpers.get(factory)
+        if helper is None:
+            helper = self._helpers[factory] = factory(self)
+        return helper
+
+    def file_stamp(self):
+        stamp = []
+        for path in (self.path, self.compacting_path, self.log_path):
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def reload_if_changed(self):
+        # Load on first use; afterwards only re-read if something else changed the files.
+        # Returns the number of migrated entries like load(), or None if nothing was read.
+        if self.loaded and (self._pending or self._jobs.unfinished_tasks):
+            return None  # unsaved edits here are newer than the files
+        with self._io_lock:
+            stamp = self.file_stamp()
+            if self._stamp is not None and stamp == self._stamp:
+                return None
+            self._stamp = stamp  # a failed load is not retried until the files change again
+        removed = list(self.items.values())
+        migrated = self.load()
+        self.reloading = True
+        try:
+            self._notify(removed, list(self.items.values()))
+        finally:
+            self.reloading = False
+        return migrated
+
+    def add(self, hw):
+        # Store a new homework entry and give it the next free ID
+        hw.id = self.next_id
+        self.next_id += 1
+        self.items[hw.id] = hw
+        for view in self.sorted_views.values():
+            view.insert(hw)
+        self.columns.append(hw)
+        self._pending.append({'op': 'put', 'record': hw.to_dict()})
+        self.version += 1
+        self._notify([], [hw])
+        return hw.id
+
+    def add_many(self, homework):
+        # Add a batch of new entries with one merge per sorted view, one log record per entry
+        # and a single change notification
+        homework = list(homework)
+        if not homework:
+            return []
+        for hw in homework:
+            hw.id = self.next_id
+            self.next_id += 1
+            self.items[hw.id] = hw
+            self.columns.append(hw)
+            self._pending.append({'op': 'put', 'record': hw.to_dict()})
+        for view in self.sorted_views.values():
+            view.insert_many(homework)
+        self.version += 1
+        self._notify([], homework)
+        return [hw.id for hw in homework]
+
+    def replace(self, hw_id, hw):
+        # Swap in an edited entry under the same ID
+        old = self.items[hw_id]
+        hw.id = hw_id
+        for view in self.sorted_views.values():
+            view.remove(old)
+            view.insert(hw)
+        self.items[hw_id] = hw
+        self.columns.update(hw)
+        self._pending.append({'op': 'put', 'record': hw.to_dict()})
+        self.version += 1
+        self._notify([old], [hw])
+
+    def remove_many(self, ids):
+        # Delete several entries with one pass over each sorted view
+        removed = [self.items.pop(hw_id) for hw_id in ids if hw_id in self.items]
+        if removed:
+            removed_ids = {hw.id for hw in removed}
+            for view in self.sorted_views.values():
+                view.discard_many(removed_ids)
+            for hw_id in removed_ids:
+                self.columns.remove(hw_id)
+            self._pending.append({'op': 'delete', 'ids': sorted(removed_ids)})
+            self.version += 1
+            self._notify(removed, [])
+        return removed
+
+    def apply_changes(self, remove_ids, put):
+        # Remove entries and put others in under their own (existing) IDs as one change;
+        # used to undo and redo. Returns the entries that were taken out.
+        drop = set(remove_ids) | {hw.id for hw in put}
+        removed = [self.items.pop(hw_id) for hw_id in list(drop) if hw_id in self.items]
+        removed_ids = {hw.id for hw in removed}
+        for view in self.sorted_views.values():
+            view.discard_many(removed_ids)
+            view.insert_many(put)
+        for hw_id in removed_ids:
+            self.columns.remove(hw_id)
+        for hw in put:
+            self.items[hw.id] = hw
+            self.columns.append(hw)
+            self.next_id = max(self.next_id, hw.id + 1)
+        deleted = removed_ids - {hw.id for hw in put}
+        if deleted:
+            self._pending.append({'op': 'delete', 'ids': sorted(deleted)})
+        self._pending.extend({'op': 'put', 'record': hw.to_dict()} for hw in put)
+        self.version += 1
+        self._notify(removed, list(put))
+        return removed
+
+    def load(self):
+        # Stream the snapshot in record by record, then replay any logged mutations on top.
+        # Corrupt records are skipped and listed in `load_errors` (the damaged files are backed
+        # up first). Snapshot entries saved before IDs existed (or with a clashing ID) get fresh
+        # IDs in file order; returns how many were assigned so the caller can re-save.
+        self.flush()
+        if self._snapshot is not None:
+            with self._snapshot.lock:
+                self._snapshot.close()
+        self._snapshot = SnapshotFile(self.path)
+        self.load_errors = []
+        # Stays True if reading fails outright, so save() can't overwrite data it never saw
+        self.load_failed = True
+        items = {}
+        pending = []
+        if os.path.exists(self.path):
+            name = os.path.basename(self.path)
+            for record, line_no, offset, length in iter_snapshot(self.path, self.load_errors):
+                try:
+                    hw = homework_from_dict(record)
+                except (ValueError, KeyError, TypeError) as e:
+                    self.load_errors.append(f"{name} line {line_no}: {e}")
+                    continue
+                if offset is not None and len(hw.description) > LAZY_DESCRIPTION_CHARS:
+                    hw.description = LazyText(self._snapshot, offset, length)
+                if hw.id is not None and hw.id not in items:
+                    items[hw.id] = hw
+                else:
+                    pending.append(hw)
+        self.next_id = max(items, default=0) + 1
+        for hw in pending:
+            hw.id = self.next_id
+            self.next_id += 1
+            items[hw.id] = hw
+        self.items = items
+        self._pending = []
+        # A leftover .compacting log means the app stopped mid-compaction; it is replayed first
+        leftover = os.path.exists(self.compacting_path)
+        for log_path in (self.compacting_path, self.log_path):
+            self._replay_log(log_path)
+        for view in self.sorted_views.values():
+            view.rebuild(self.items.values())
+        self.columns.rebuild(self.items.values())
+        if self.load_errors:
+            self._backup_damaged_files()
+        self._needs_compaction = bool(pending) or leftover
+        self._log_bytes = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        self.version += 1
+        self.generation += 1
+        self.load_failed = False
+        self.loaded = True
+        with self._io_lock:
+            self._stamp = self.file_stamp()
+        return len(pending)
+
+    def _replay_log(self, log_path):
+        if not os.path.exists(log_path):
+            return
+        name = os.path.basename(log_path)
+        with open(log_path, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                    op = entry['op']
+                    if op == 'put':
+                        hw = homework_from_dict(entry['record'])
+                        self.items[hw.id] = hw
+                        self.next_id = max(self.next_id, hw.id + 1)
+                    elif op == 'delete':
+                        for hw_id in entry['ids']:
+                            self.items.pop(hw_id, None)
+                    elif op == 'next_id':
+                        self.next_id = max(self.next_id, entry['value'])
+                except (ValueError, KeyError, TypeError) as e:
+                    # Usually a torn last line from a crash mid-append; the lines before it are intact
+                    self.load_errors.append(f"{name} line {line_no}: {e}")
+
+    def _backup_damaged_files(self):
+        # Keep a copy of files with corrupt records before compaction rewrites them
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        for path in (self.path, self.compacting_path, self.log_path):
+            if os.path.exists(path):
+                try:
+                    shutil.copy2(path, f"{path}.corrupt-{stamp}")
+                except OSError as e:
+                    print(f"Error backing up {path}: {e}")
+
+    def save(self):
+        # Queue the mutations made since the last save for the writer thread (and a compaction
+        # once the log is big enough). Returns straight away; see write_errors.
+        if self.load_failed:
+            raise RuntimeError("homework data could not be loaded, so it was not overwritten")
+        if self._pending:
+            lines = "".join(json.dumps(entry) + "\n" for entry in self._pending)
+            self._pending = []
+            self._log_bytes += len(lines)
+            self._submit(('append', lines))
+        if self._needs_compaction or self._log_bytes > self.LOG_COMPACT_BYTES:
+            self.compact()
+
+    def compact(self):
+        # Queue a compaction of the log into a new snapshot.
+        # Edits replace Homework objects rather than mutating them, so a list of the current
+        # objects is a consistent snapshot the writer can serialise record by record; jobs run
+        # in order, so the log it rotates holds exactly the changes this list already includes.
+        self._needs_compaction = False
+        self._log_bytes = 0
+        self._submit(('compact', list(self.items.values()), self.next_id, self._snapshot))
+
+    def flush(self):
+        # Block until every queued write has been done
+        self._jobs.join()
+
+    def _submit(self, job):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="homework-writer", daemon=True)
+            self._writer.start()
+            # Daemon threads are killed at exit, so finish the queue first
+            atexit.register(self.flush)
+        self._jobs.put(job)
+
+    def _write_loop(self):
+        while True:
+            jobs = [self._jobs.get()]
+            # Take the whole burst that queued up meanwhile; consecutive appends become one write
+            while True:
+                try:
+                    jobs.append(self._jobs.get_nowait())
+                except queue.Empty:
+                    break
+            appends = []
+            for job in jobs:
+                if job[0] == 'append':
+                    appends.append(job[1])
+                else:
+                    self._append_log(appends)
+                    appends = []
+                    self._compact_now(*job[1:])
+            self._append_log(appends)
+            for _ in jobs:
+                self._jobs.task_done()
+
+    def _append_log(self, chunks):
+        chunks = self._unwritten + chunks
+        if not chunks:
+            return
+        try:
+            with self._io_lock:
+                with open(self.log_path, 'a') as f:
+                    f.write("".join(chunks))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._stamp = self.file_stamp()
+            self._unwritten = []
+        except OSError as e:
+            self._unwritten = chunks
+            self.write_errors.put(f"Failed to save homework data (will retry on the next save): {e}")
+
+    def _compact_now(self, homework, next_id, source):
+        # Runs on the writer thread; the log is rotated first so later appends go to a fresh log
+        try:
+            with self._io_lock:
+                if os.path.exists(self.log_path):
+                    if os.path.exists(self.compacting_path):
+                        # Keep the leftover log from an interrupted compaction until the snapshot is written
+                        with open(self.log_path, 'r') as src, open(self.compacting_path, 'a') as dst:
+                            dst.write(src.read())
+                        os.remove(self.log_path)
+                    else:
+                        os.replace(self.log_path, self.compacting_path)
+                # Remember the next ID so IDs of deleted entries are never handed out again
+                with open(self.log_path, 'a') as f:
+                    f.write(json.dumps({'op': 'next_id', 'value': next_id}) + "\n")
+                self._stamp = self.file_stamp()
+        except OSError as e:
+            self._needs_compaction = True
+            self.write_errors.put(f"Failed to compact homework data: {e}")
+            return
+        if self._write_snapshot(homework, source):
+            # Appends that failed earlier are covered by the snapshot now
+            self._unwritten = []
+        else:
+            self._needs_compaction = True
+
+    def _write_snapshot(self, homework, source):
+        moved = []  # (lazy description, new offset, new length) for descriptions left on disk
+
+        def lines():
+            # One record per line; json.dumps output is ASCII, so len() is the byte length
+            offset = 2
+            yield "[\n"
+            last = len(homework) - 1
+            for i, hw in enumerate(homework):
+                line = json.dumps(hw.to_dict()) + (",\n" if i < last else "\n")
+                ref = hw.lazy_description
+                if ref is not None:
+                    moved.append((ref, offset, len(line)))
+                offset += len(line)
+                yield line
+            yield "]\n"
+
+        try:
+            tmp_path = write_temp(self.path, lines())
+            with self._io_lock:
+                try:
+                    with source.lock:
+                        source.close()
+                        os.replace(tmp_path, self.path)
+                        for ref, offset, length in moved:
+                            ref.offset = offset
+                            ref.length = length
+                except BaseException:
+                    discard_temp(tmp_path)
+                    raise
+                if os.path.exists(self.compacting_path):
+                    os.remove(self.compacting_path)
+                self._stamp = self.file_stamp()
+            return True
+        except Exception as e:
+            # The rotated log is kept, so nothing is lost; the next load replays it
+            self.write_errors.put(f"Failed to compact homework data: {e}")
+            return False
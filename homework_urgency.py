@@ -0,0 +1,81 @@
+import datetime  # For date handling
+import heapq  # For the priority queue
+import itertools  # For tie-breaking heap entries
+
+BASE_MINUTES = 30  # work assumed for homework without a time estimate
+
+
+def urgency(hw, today):
+    # Higher is more urgent: the work left spread over the days until it is due,
+    # growing with every day an entry is overdue
+    work = (hw.time_required if hw.is_timed else 0) + BASE_MINUTES
+    days_left = hw.due_ordinal - today
+    if days_left >= 0:
+        return work / (days_left + 1)
+    return work * (1 - days_left)
+
+
+class UrgencyQueue:
+    # Pending homework ranked by urgency(), for the planner's "Next up" panel.
+    #
+    # Entries live in a heap that is updated from the store's change notifications: an add or
+    # edit pushes a new entry in O(log n) and the entry it replaces is invalidated lazily (it is
+    # only dropped when it reaches the top). The scores depend on today's date, so the heap is
+    # rebuilt the first time it is read after the date rolls over.
+    def __init__(self, store):
+        self.store = store
+        self._heap = []   # (-urgency, due ordinal, hw_id, push number, hw)
+        self._live = {}   # hw_id -> its current heap entry
+        self._pushes = itertools.count()  # an edit can re-push an ID with an equal score
+        self._today = None  # day the scores were computed for; None until first read
+        store.subscribe(self._on_change)
+
+    @staticmethod
+    def _eligible(hw):
+        return hw.status.lower() != 'completed' and hw.due_ordinal is not None
+
+    def _push(self, hw):
+        entry = (-urgency(hw, self._today), hw.due_ordinal, hw.id, next(self._pushes), hw)
+        self._live[hw.id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _rebuild(self, today):
+        self._today = today
+        self._live = {}
+        for hw in self.store:
+            if self._eligible(hw):
+                self._live[hw.id] = (-urgency(hw, today), hw.due_ordinal, hw.id, next(self._pushes), hw)
+        self._heap = list(self._live.values())
+        heapq.heapify(self._heap)
+
+    def _on_change(self, removed, added):
+        if self._today is None:
+            return  # not built yet
+        if self.store.reloading:
+            self._today = None  # everything changed; rebuild on the next read
+            return
+        for hw in removed:
+            self._live.pop(hw.id, None)
+        for hw in added:
+            if self._eligible(hw):
+                self._push(hw)
+        if len(self._heap) > 2 * len(self._live) + 64:
+            # Mostly stale entries: start over rather than let the heap keep growing
+            self._rebuild(self._today)
+
+    def top(self, n, today=None):
+        # The n most urgent pending homework, most urgent first
+        today = (today or datetime.date.today()).toordinal()
+        if today != self._today:
+            self._rebuild(today)
+        result = []
+        kept = []
+        while self._heap and len(result) < n:
+            entry = heapq.heappop(self._heap)
+            if self._live.get(entry[2]) is entry:
+                kept.append(entry)
+                result.append(entry[4])
+            # stale entries are simply dropped here
+        for entry in kept:
+            heapq.heappush(self._heap, entry)
+        return result
@@ -1,7 +1,19 @@
+import time
+STARTED = time.perf_counter()  # for the startup timing report
+
+import importlib
+import os
+import sys
+import threading
 import tkinter as tk
-from homework_planner import HomeworkPlannerApp
-from pomodoro_timer import PomodoroTimer  # Import the PomodoroTimer class
-from calandar_timetable import CalendarApp
+
+# The feature modules (and pygame, which pomodoro_timer pulls in) are imported when their
+# button is first used, so the menu shows without waiting for them. Once it has painted, a
+# background thread imports them ahead of time unless --no-warmup is given.
+# Run with --startup-timing (or STARTUP_TIMING=1) to print how long startup and each import took.
+FEATURE_MODULES = ("homework_planner", "calandar_timetable", "pomodoro_timer")
+WARMUP = "--no-warmup" not in sys.argv
+STARTUP_TIMING = "--startup-timing" in sys.argv or os.environ.get("STARTUP_TIMING") == "1"
 
 # Colors and fonts
 BG_COLOR = "#f5f6fa"
@@ -17,17 +29,47 @@ def on_enter(e):
 def on_leave(e):
     e.widget['background'] = BTN_COLOR
 
+def load_feature(name):
+    # Import a feature module on first use, timing the import for the startup report
+    # (import_module also waits for an import the warm-up thread is still running)
+    fresh = name not in sys.modules
+    began = time.perf_counter()
+    module = importlib.import_module(name)
+    if STARTUP_TIMING and fresh:
+        print(f"[startup] import {name}: {(time.perf_counter() - began) * 1000:.0f} ms "
+              f"({threading.current_thread().name})")
+    return module
+
+def warm_up():
+    # Import the feature modules in the background so the first click opens quickly
+    for name in FEATURE_MODULES:
+        try:
+            load_feature(name)
+        except Exception as e:
+            print(f"Could not preload {name}: {e}")  # the button shows the real error on use
+
+def on_first_frame():
+    # Finish the pending geometry and redraws first, so the timing and the warm-up start
+    # only once the menu has painted and is taking input
+    root.update_idletasks()
+    if STARTUP_TIMING:
+        print(f"[startup] main menu interactive after {(time.perf_counter() - STARTED) * 1000:.0f} ms")
+    if WARMUP:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
 def open_homework_planner():
-    app = HomeworkPlannerApp(root)
+    app = load_feature("homework_planner").HomeworkPlannerApp(root)
     app.open_homework_planner_window()
 
 def open_calendar_app():
+    CalendarApp = load_feature("calandar_timetable").CalendarApp
     calendar_window = tk.Toplevel(root)
     calendar_window.title("Calendar App")
     calendar_window.geometry("1050x700")
     CalendarApp(calendar_window)  # attach the calendar to this window
     
 def open_pomodoro_timer():
+    PomodoroTimer = load_feature("pomodoro_timer").PomodoroTimer
     pomo_window = tk.Toplevel(root)
     pomo_window.title("Pomodoro Timer")
     PomodoroTimer(pomo_window)
@@ -69,4 +111,5 @@ btn_pomo.bind("<Leave>", on_leave)
 
 tk.Label(main_frame, text="© 2025 TAR UMT Student Assistant", font=("Segoe UI", 9), bg=BG_COLOR, fg="#636e72").pack(side="bottom", pady=10, fill="x")
 
+root.after_idle(on_first_frame)  # queued after the menu's own drawing
 root.mainloop() 
\ No newline at end of file
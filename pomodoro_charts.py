@@ -0,0 +1,94 @@
+import datetime  # For day ordinals and labels
+import numpy as np  # For binning and the pixel grid
+
+# Heatmap colours from no focus to the most focused days (GitHub-style greens)
+LEVEL_COLORS = np.array([(235, 237, 240), (155, 233, 168), (64, 196, 99), (48, 161, 78), (33, 110, 57)],
+                        dtype=np.uint8)
+BACKGROUND = (245, 245, 245)
+TREND_COLORS = {7: (9, 132, 227), 28: (214, 48, 49)}  # rolling window (days) -> line colour
+LEFT, TOP = 30, 18  # room for weekday and year labels
+TREND_HEIGHT = 150
+
+
+def daily_focus(days, first, last):
+    # Focus minutes for each day first..last (day ordinals) from SessionLog.days, binned with
+    # np.bincount so any number of days costs one vectorized pass
+    if not days:
+        return np.zeros(last - first + 1)
+    ordinals = np.fromiter((datetime.date.fromisoformat(day).toordinal() for day in days),
+                           dtype=np.int64, count=len(days))
+    seconds = np.fromiter((totals['focus'] for totals in days.values()), dtype=np.float64, count=len(days))
+    inside = (ordinals >= first) & (ordinals <= last)
+    return np.bincount(ordinals[inside] - first, weights=seconds[inside], minlength=last - first + 1) / 60
+
+
+def levels(minutes):
+    # 0 for days without focus, 1-4 by quartile of the days with some
+    level = np.zeros(minutes.shape, dtype=np.intp)
+    active = minutes > 0
+    if active.any():
+        edges = np.quantile(minutes[active], [0.25, 0.5, 0.75])
+        level[active] = 1 + np.searchsorted(edges, minutes[active], side='right').clip(0, 3)
+    return level
+
+
+def rolling_mean(minutes, window):
+    # Trailing mean over `window` days (shorter at the start of the range)
+    sums = np.cumsum(np.concatenate(([0.0], minutes)))
+    counts = np.minimum(np.arange(1, len(minutes) + 1), window)
+    return (sums[1:] - sums[np.maximum(np.arange(1, len(minutes) + 1) - window, 0)]) / counts
+
+
+def render_history(days, first, last, width):
+    # One PIL image with the calendar heatmap (a column per week, a row per weekday) and the
+    # rolling 7- and 28-day focus trends underneath. The heatmap is built as a pixel array,
+    # so drawing it does not depend on how many days it covers.
+    from PIL import Image, ImageDraw  # only needed when the history is shown
+    first -= datetime.date.fromordinal(first).weekday()  # start the grid on a Monday
+    minutes = daily_focus(days, first, last)
+    weeks = -(-len(minutes) // 7)
+    cell = max(1, min(14, (width - LEFT - 10) // weeks))
+    gap = 1 if cell > 3 else 0
+
+    # Heatmap: levels laid out weekday x week (days after `last` left blank), scaled up to cells
+    palette = np.vstack((LEVEL_COLORS, np.array([BACKGROUND], dtype=np.uint8)))
+    grid = np.full(weeks * 7, len(LEVEL_COLORS), dtype=np.intp)
+    grid[:len(minutes)] = levels(minutes)
+    pixels = palette[grid.reshape(weeks, 7).T]
+    pixels = pixels.repeat(cell, axis=0).repeat(cell, axis=1)
+    if gap:
+        pixels[cell - 1::cell, :] = BACKGROUND
+        pixels[:, cell - 1::cell] = BACKGROUND
+    heat_height = 7 * cell
+    height = TOP + heat_height + 30 + TREND_HEIGHT + 20
+    image = Image.new('RGB', (width, height), BACKGROUND)
+    image.paste(Image.fromarray(pixels), (LEFT, TOP))
+
+    draw = ImageDraw.Draw(image)
+    for row, name in ((0, "Mon"), (2, "Wed"), (4, "Fri")):
+        draw.text((2, TOP + row * cell + cell // 2 - 5), name, fill=(99, 110, 114))
+    year = None
+    for week in range(weeks):
+        day = datetime.date.fromordinal(first + week * 7)
+        if day.year != year:
+            year = day.year
+            draw.text((LEFT + week * cell, 2), str(year), fill=(99, 110, 114))
+
+    # Trend: rolling means sampled once per pixel column
+    chart_top = TOP + heat_height + 30
+    chart_width = width - LEFT - 10
+    columns = np.linspace(0, len(minutes) - 1, num=min(chart_width, len(minutes))).round().astype(np.intp)
+    xs = LEFT + np.linspace(0, chart_width - 1, num=len(columns))
+    trends = {window: rolling_mean(minutes, window)[columns] for window in TREND_COLORS}
+    peak = max(max(trend.max() for trend in trends.values()), 1.0)
+    draw.rectangle((LEFT, chart_top, LEFT + chart_width - 1, chart_top + TREND_HEIGHT), outline=(200, 200, 200))
+    draw.text((2, chart_top - 2), f"{peak:.0f}", fill=(99, 110, 114))
+    draw.text((2, chart_top + TREND_HEIGHT - 10), "0", fill=(99, 110, 114))
+    for window, trend in trends.items():
+        ys = chart_top + TREND_HEIGHT - trend / peak * (TREND_HEIGHT - 2)
+        if len(xs) > 1:
+            draw.line(list(zip(xs.tolist(), ys.tolist())), fill=TREND_COLORS[window], width=2)
+    legend_y = chart_top + TREND_HEIGHT + 4
+    draw.text((LEFT, legend_y), "7-day average (min/day)", fill=TREND_COLORS[7])
+    draw.text((LEFT + 170, legend_y), "28-day average", fill=TREND_COLORS[28])
+    return image
@@ -0,0 +1,198 @@
+import math  # For whole seconds left
+import random  # For coin awards
+import time  # For the countdown clock
+
+# Seconds on a clock that never jumps with wall-clock changes. CLOCK_BOOTTIME (Linux) also
+# keeps counting while the machine is suspended, so a countdown catches up after resume;
+# elsewhere time.monotonic() already does (Windows) or is the best available.
+if hasattr(time, 'CLOCK_BOOTTIME'):
+    def monotonic_clock():
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+else:
+    monotonic_clock = time.monotonic
+
+
+class Timer:
+    # Timer base class for countdown logic.
+    # While running, the time left is worked out from a deadline on a monotonic clock rather than
+    # counted down tick by tick, so late ticks (modal dialogs, a busy event loop) never add drift.
+    # `_remaining_time` holds the whole seconds left as of the last start/pause/tick.
+    def __init__(self, duration=0, clock=monotonic_clock):
+        self.duration = duration  # in seconds
+        self._remaining_time = duration
+        self.is_running = False
+        self._clock = clock
+        self._deadline = None
+
+    def start(self):
+        self.is_running = True
+        self._deadline = self._clock() + self._remaining_time
+
+    def pause(self):
+        self._remaining_time = self._whole_seconds(self.remaining())
+        self.is_running = False
+
+    def reset(self):
+        self._remaining_time = self.duration
+
+    @property
+    def remaining_time(self):
+        # Whole seconds left, as shown on the clock
+        return self._remaining_time
+
+    def remaining(self):
+        # Exact seconds left (a float while running)
+        if self.is_running and self._deadline is not None:
+            return max(0.0, self._deadline - self._clock())
+        return self._remaining_time
+
+    def _whole_seconds(self, remaining):
+        # Rounding in deadline - now can land a hair above the seconds left at start;
+        # the count never goes back up
+        return min(math.ceil(remaining), self._remaining_time)
+
+    def tick(self):
+        # Bring `_remaining_time` up to date; returns the seconds until it next changes
+        remaining = self.remaining()
+        self._remaining_time = self._whole_seconds(remaining)
+        return remaining - (self._remaining_time - 1) if remaining > 0 else 0
+
+
+class PomodoroEngine(Timer):
+    # The Pomodoro rules with no UI: focus / short break / long break phases, the 4-session
+    # cycle, the focus count and coin awards.
+    #
+    # The clock and random generator are injected, so simulated sessions run instantly without
+    # a display. Whoever shows the timer subscribes with callback(event, data) and reacts to:
+    #   'focus_time'      data: seconds   focus time that passed since the last tick
+    #   'focus_completed' data: skipped   a focus session ended (naturally or by Skip)
+    #   'phase_ended'     data: phase, planned, actual, skipped   any phase ended; the
+    #                     seconds planned for it and the seconds it actually ran
+    #   'coins_awarded'   data: earned
+    #   'phase_changed'   data: phase     a new phase is loaded (not started)
+    FOCUS = "focus"
+    SHORT_BREAK = "short_break"
+    LONG_BREAK = "long_break"
+    SESSIONS_PER_CYCLE = 4
+
+    def __init__(self, focus_minutes=25, break_minutes=5, long_break_minutes=10, coins=0,
+                 clock=monotonic_clock, rng=None):
+        super().__init__(focus_minutes * 60, clock)
+        self.focus_minutes = focus_minutes
+        self.break_minutes = break_minutes
+        self.long_break_minutes = long_break_minutes
+        self.phase = self.FOCUS
+        self.pomodoro_count = 0
+        self.focus_sessions_in_cycle = 0
+        self.coins = coins
+        self.rng = rng or random.Random()
+        self._listeners = []
+
+    @property
+    def is_focus(self):
+        return self.phase == self.FOCUS
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def _emit(self, event, **data):
+        for callback in list(self._listeners):
+            callback(event, data)
+
+    def phase_seconds(self, phase):
+        minutes = {self.FOCUS: self.focus_minutes, self.SHORT_BREAK: self.break_minutes,
+                   self.LONG_BREAK: self.long_break_minutes}[phase]
+        return minutes * 60
+
+    def set_durations(self, focus_minutes, break_minutes, long_break_minutes):
+        # New phase lengths; the current phase starts over with its new length
+        self.focus_minutes = focus_minutes
+        self.break_minutes = break_minutes
+        self.long_break_minutes = long_break_minutes
+        self.duration = self.phase_seconds(self.phase)
+        self._remaining_time = self.duration
+        if self.is_running:
+            self._deadline = self._clock() + self._remaining_time
+
+    # ----- Checkpoints -----
+    def state(self):
+        # What is needed to carry on later, as JSON-friendly values
+        return {'phase': self.phase, 'remaining': self.remaining(), 'running': self.is_running,
+                'pomodoro_count': self.pomodoro_count, 'focus_sessions_in_cycle': self.focus_sessions_in_cycle}
+
+    def restore(self, state, elapsed=0):
+        # Carry on from state(); a phase that was running lost `elapsed` seconds meanwhile, and
+        # if that used it up the next update() ends it as if the timer had kept going.
+        # Every field is read before any is applied, so a bad state leaves the engine unchanged.
+        phase = state['phase']
+        if phase not in (self.FOCUS, self.SHORT_BREAK, self.LONG_BREAK):
+            raise ValueError(f"unknown phase {phase!r}")
+        pomodoro_count = int(state['pomodoro_count'])
+        focus_sessions_in_cycle = int(state['focus_sessions_in_cycle'])
+        duration = self.phase_seconds(phase)
+        remaining = max(0.0, min(float(state['remaining']), duration))
+        running = bool(state['running'])
+        self.phase = phase
+        self.pomodoro_count = pomodoro_count
+        self.focus_sessions_in_cycle = focus_sessions_in_cycle
+        self.duration = duration
+        self._remaining_time = math.ceil(remaining)
+        self.is_running = running
+        self._deadline = self._clock() + remaining - max(0, elapsed) if running else None
+
+    # ----- Transitions -----
+    def update(self):
+        # Advance to the clock; returns the seconds until the next whole-second change,
+        # or None once the phase has run out (the next phase is then loaded, not started)
+        if not self.is_running:
+            return None
+        before = self._remaining_time
+        wait = self.tick()
+        if self.is_focus and before > self._remaining_time:
+            self._emit('focus_time', seconds=before - self._remaining_time)
+        if self._remaining_time > 0:
+            return wait
+        self.is_running = False
+        self._emit('phase_ended', phase=self.phase, planned=self.duration, actual=self.duration, skipped=False)
+        if self.is_focus:
+            self.pomodoro_count += 1
+            self._emit('focus_completed', skipped=False)
+        self.next_phase()
+        return None
+
+    def skip(self):
+        # End the current phase now; a skipped focus session still counts and earns coins
+        if self.is_running:
+            self.pause()
+        self._emit('phase_ended', phase=self.phase, planned=self.duration,
+                   actual=self.duration - self._remaining_time, skipped=True)
+        if self.is_focus:
+            self.pomodoro_count += 1
+            self._emit('focus_completed', skipped=True)
+            self.award_coins()
+        self.next_phase()
+
+    def reset(self):
+        # Stop and start the current phase over
+        self.is_running = False
+        self.duration = self.phase_seconds(self.phase)
+        super().reset()
+
+    def next_phase(self):
+        if self.is_focus:
+            self.focus_sessions_in_cycle += 1
+            if self.focus_sessions_in_cycle % self.SESSIONS_PER_CYCLE == 0:
+                self.phase = self.LONG_BREAK
+            else:
+                self.phase = self.SHORT_BREAK
+        else:
+            self.phase = self.FOCUS
+        self.duration = self.phase_seconds(self.phase)
+        self._remaining_time = self.duration
+        self._emit('phase_changed', phase=self.phase)
+
+    def award_coins(self):
+        earned = self.rng.randint(1, 3)
+        self.coins += earned
+        self._emit('coins_awarded', earned=earned)
+        return earned
@@ -0,0 +1,168 @@
+import datetime  # For session times and day/week grouping
+import json  # For the JSON-lines log and the rollup file
+import os    # For file existence checks
+from file_utils import atomic_write  # For crash-safe rollup saves
+
+SESSION_FILE = "pomodoro_sessions.jsonl"
+ROLLUP_FILE = "pomodoro_rollups.json"
+HEAD_BYTES = 64  # start of the log kept with the rollups, to notice a replaced log
+
+
+def new_day():
+    # Focus seconds, completed and skipped focus sessions, and break seconds on one day
+    return {'focus': 0, 'completed': 0, 'skipped': 0, 'break': 0}
+
+
+class SessionLog:
+    # Every Pomodoro phase that ended (focus or break, completed or skipped), for the history
+    # window.
+    #
+    # Sessions are appended to a JSON-lines file as one event each and never rewritten. Per-day
+    # totals are precomputed in a rollup file together with the byte offset of the log they
+    # cover, so opening the history only reads the sessions logged since the rollups were last
+    # saved instead of every session ever. If the log was shortened or replaced, the rollups
+    # are rebuilt from the whole log. A session counts towards the day it ended.
+    # Like FocusLedger there is one shared instance per file.
+    _shared = {}  # absolute path -> SessionLog
+
+    @classmethod
+    def shared(cls, path=SESSION_FILE, rollup_path=ROLLUP_FILE):
+        key = os.path.abspath(path)
+        log = cls._shared.get(key)
+        if log is None:
+            log = cls._shared[key] = cls(path, rollup_path)
+        return log
+
+    def __init__(self, path=SESSION_FILE, rollup_path=ROLLUP_FILE):
+        self.path = path
+        self.rollup_path = rollup_path
+        self.days = {}  # 'YYYY-MM-DD' -> new_day() totals
+        self._offset = 0  # bytes of the log that `days` covers
+        self._head = ""
+        self._saved_offset = None  # offset in the rollup file, None if it must be written
+        self._torn = False  # log ends mid-line, so the next append starts a new line first
+        self.load()
+
+    # ----- Loading -----
+    def load(self):
+        self._load_rollups()
+        if not self._read_log():
+            # The rollups do not match this log: count everything again
+            self.days, self._offset, self._head = {}, 0, ""
+            self._read_log()
+        if self._offset != self._saved_offset:
+            self.save_rollups()
+
+    def _load_rollups(self):
+        self.days, self._offset, self._head, self._saved_offset = {}, 0, "", None
+        if not os.path.exists(self.rollup_path):
+            return
+        try:
+            with open(self.rollup_path, 'r') as f:
+                rollups = json.load(f)
+            days = {day: dict(new_day(), **totals) for day, totals in rollups['days'].items()}
+            offset, head = int(rollups['offset']), rollups['head']
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Rebuilding Pomodoro rollups: {e}")
+            return
+        self.days, self._offset, self._head, self._saved_offset = days, offset, head, offset
+
+    def _read_log(self):
+        # Add the sessions after `_offset` to the day totals; False if the log does not
+        # continue the one the rollups were made from
+        self._torn = False
+        if not os.path.exists(self.path):
+            return self._offset == 0
+        with open(self.path, 'rb') as f:
+            head = f.read(HEAD_BYTES).decode('utf-8', 'replace')
+            size = os.fstat(f.fileno()).st_size
+            if self._offset > size or not head.startswith(self._head):
+                return False
+            self._head = head
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    self._torn = True  # an unfinished last line; leave it out of the offset
+                    break
+                self._offset += len(line)
+                try:
+                    self._add(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"Skipped Pomodoro session line: {e}")
+        return True
+
+    def _add(self, session):
+        totals = self.days.setdefault(session['end'][:10], new_day())
+        if session['phase'] == 'focus':
+            totals['focus'] += session['actual']
+            totals['skipped' if session['outcome'] == 'skipped' else 'completed'] += 1
+        else:
+            totals['break'] += session['actual']
+
+    def save_rollups(self):
+        try:
+            atomic_write(self.rollup_path, json.dumps({'offset': self._offset, 'head': self._head,
+                                                       'days': self.days}))
+            self._saved_offset = self._offset
+        except OSError as e:
+            print(f"Could not save Pomodoro rollups: {e}")
+
+    # ----- Recording -----
+    def record(self, phase, started, ended, planned, actual, task, skipped):
+        # Append one finished phase; `started`/`ended` are datetimes, the rest seconds
+        session = {'phase': phase, 'start': started.isoformat(timespec='seconds'),
+                   'end': ended.isoformat(timespec='seconds'), 'planned': int(planned),
+                   'actual': int(round(actual)), 'task': task,
+                   'outcome': 'skipped' if skipped else 'completed'}
+        line = ("\n" if self._torn else "") + json.dumps(session) + "\n"
+        with open(self.path, 'ab') as f:
+            f.write(line.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+            end = f.tell()
+        if len(self._head) < HEAD_BYTES:
+            with open(self.path, 'rb') as f:
+                self._head = f.read(HEAD_BYTES).decode('utf-8', 'replace')
+        self._torn = False
+        self._offset = end  # a torn line before this one is skipped, it is not a session
+        self._add(session)
+
+    # ----- Analytics -----
+    def focus_minutes(self, day):
+        return self.days.get(day.isoformat(), new_day())['focus'] // 60
+
+    def weekly_minutes(self, weeks, today=None):
+        # [(monday, focus minutes), ...] for the last `weeks` weeks, oldest first
+        today = today or datetime.date.today()
+        monday = today - datetime.timedelta(days=today.weekday())
+        first = monday - datetime.timedelta(weeks=weeks - 1)
+        totals = [0] * weeks
+        for day, day_totals in self.days.items():
+            index = (datetime.date.fromisoformat(day) - first).days // 7
+            if 0 <= index < weeks:
+                totals[index] += day_totals['focus']
+        return [(first + datetime.timedelta(weeks=i), seconds // 60) for i, seconds in enumerate(totals)]
+
+    def streaks(self, today=None):
+        # (current, longest) runs of consecutive days with focus time; the current streak
+        # still counts if today has none yet but yesterday did
+        today = today or datetime.date.today()
+        focus_days = sorted(datetime.date.fromisoformat(day).toordinal()
+                            for day, totals in self.days.items() if totals['focus'] > 0)
+        longest = run = 0
+        previous = None
+        for day in focus_days:
+            run = run + 1 if previous == day - 1 else 1
+            longest = max(longest, run)
+            previous = day
+        current = run if previous is not None and previous >= today.toordinal() - 1 else 0
+        return current, longest
+
+    def totals(self):
+        # All-time (focus minutes, completed, skipped) focus sessions
+        focus = completed = skipped = 0
+        for day_totals in self.days.values():
+            focus += day_totals['focus']
+            completed += day_totals['completed']
+            skipped += day_totals['skipped']
+        return focus // 60, completed, skipped
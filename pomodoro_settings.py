@@ -0,0 +1,122 @@
+import atexit  # For flushing a pending save on exit
+import hashlib  # For the settings checksum
+import json  # For the settings file
+import os    # For file existence checks
+import threading  # For the background writer
+import time  # For the save delay
+from file_utils import atomic_write  # For crash-safe saves
+
+SETTINGS_FILE = "pomodoro_settings.json"
+SAVE_DELAY = 0.5  # seconds a save waits for more changes before it is written
+
+
+def checksum(settings):
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class SettingsFile:
+    # The Pomodoro settings file, saved in the background.
+    #
+    # save() only hands a copy of the settings to a writer thread, which waits SAVE_DELAY for
+    # more changes (a burst of coin awards is one write) and then writes the file atomically,
+    # as {"checksum": ..., "settings": {...}}. Each write also refreshes a .bak copy, so a
+    # damaged or hand-broken file is recovered from the last good one instead of falling back
+    # to the defaults. Files from before the checksum (a plain settings object) still load.
+    # Like the other stores there is one shared instance per file.
+    _shared = {}  # absolute path -> SettingsFile
+
+    @classmethod
+    def shared(cls, path=SETTINGS_FILE):
+        key = os.path.abspath(path)
+        settings_file = cls._shared.get(key)
+        if settings_file is None:
+            settings_file = cls._shared[key] = cls(path)
+        return settings_file
+
+    def __init__(self, path=SETTINGS_FILE):
+        self.path = path
+        self.backup_path = path + ".bak"
+        self._lock = threading.Condition()
+        self._pending = None  # text of the newest save not written yet
+        self._due = 0.0  # time.monotonic() when the pending save is written
+        self._writing = False
+        self._writer = None
+
+    # ----- Loading -----
+    def load(self):
+        # The saved settings, from the backup if the file is damaged; None if neither is usable
+        self.flush()
+        settings = self._read(self.path)
+        if settings is None:
+            settings = self._read(self.backup_path)
+            if settings is not None:
+                print(f"{self.path} is damaged; restored it from {self.backup_path}")
+                self._write(self._encode(settings))
+        return settings
+
+    def _read(self, path):
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and 'checksum' in data:
+                settings = data['settings']
+                if checksum(settings) != data['checksum']:
+                    raise ValueError("checksum does not match")
+            else:
+                settings = data  # saved before checksums were added
+            if not isinstance(settings, dict):
+                raise ValueError("not a settings object")
+            return settings
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Could not read {path}: {e}")
+            return None
+
+    # ----- Saving -----
+    @staticmethod
+    def _encode(settings):
+        return json.dumps({'checksum': checksum(settings), 'settings': settings})
+
+    def save(self, settings):
+        # Queue a save of `settings` (copied now, so later changes wait for the next save)
+        text = self._encode(settings)
+        with self._lock:
+            self._pending = text
+            self._due = time.monotonic() + SAVE_DELAY
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="settings-writer", daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+            self._lock.notify_all()
+
+    def flush(self):
+        # Write a pending save now and wait for it
+        with self._lock:
+            self._due = 0.0
+            self._lock.notify_all()
+            while self._pending is not None or self._writing:
+                self._lock.wait()
+
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                while self._pending is None:
+                    self._lock.wait()
+                while self._due > time.monotonic():
+                    self._lock.wait(self._due - time.monotonic())
+                text, self._pending = self._pending, None
+                self._writing = True
+            try:
+                self._write(text)
+            except OSError as e:
+                print(f"Error saving settings: {e}")
+            finally:
+                with self._lock:
+                    self._writing = False
+                    self._lock.notify_all()
+
+    def _write(self, text):
+        # The backup first, so there is always one good copy while the file is replaced
+        atomic_write(self.backup_path, text)
+        atomic_write(self.path, text)
@@ -0,0 +1,97 @@
+import os  # For sound file stamps
+import queue  # For handing cues to the audio worker
+import threading  # For the audio worker
+import time  # For measuring cue latency
+import pygame
+
+
+class SoundPlayer:
+    # Plays the Pomodoro cues (focus, break, complete) from sounds decoded into memory.
+    #
+    # One long-lived worker thread owns the mixer: it initializes it once, decodes sounds into
+    # pygame.mixer.Sound objects when they are preloaded, and plays queued cues. The UI thread
+    # only puts jobs on the queue, so a cue never waits on disk or decoding and rapid skips do
+    # not start a thread each. Decoded sounds are keyed by path and checked against the file's
+    # (mtime, size), so a sound overwritten through the settings is decoded again.
+    # `last_latency` is the seconds between the last play() call and the sound starting.
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._sounds = {}  # path -> ((mtime_ns, size), Sound)
+        self._channel = None  # channel of the cue playing now
+        self._mixer_ready = None  # None until the worker tries to initialize the mixer
+        self.last_latency = None
+        self._worker = threading.Thread(target=self._run, name="pomodoro-sound", daemon=True)
+        self._worker.start()
+
+    def preload(self, *paths):
+        # Decode sounds ahead of their first cue (in the background)
+        for path in paths:
+            if path:
+                self._jobs.put(('load', path, None))
+
+    def play(self, path):
+        # Queue a cue; it replaces whatever cue is still playing
+        if path:
+            self._jobs.put(('play', path, time.perf_counter()))
+
+    def stop(self):
+        self._jobs.put(('stop', None, None))
+
+    def flush(self):
+        # Wait until every queued job has been handled
+        self._jobs.join()
+
+    def _run(self):
+        while True:
+            job, path, queued_at = self._jobs.get()
+            try:
+                if self._init_mixer():
+                    if job == 'load':
+                        self._load(path)
+                    elif job == 'play':
+                        self._play(path, queued_at)
+                    elif self._channel is not None:
+                        self._channel.stop()
+                        self._channel = None
+            except Exception as e:
+                print(f"Error playing sound: {e}")
+            finally:
+                self._jobs.task_done()
+
+    def _init_mixer(self):
+        if self._mixer_ready is None:
+            try:
+                pygame.mixer.init()
+                self._mixer_ready = True
+            except pygame.error as e:
+                print(f"Sound is off, could not open the audio device: {e}")
+                self._mixer_ready = False
+        return self._mixer_ready
+
+    def _load(self, path):
+        # The decoded sound for a path, decoding it again if the file has changed
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._sounds.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        sound = pygame.mixer.Sound(path)
+        self._sounds[path] = (stamp, sound)
+        return sound
+
+    def _play(self, path, queued_at):
+        cached = self._sounds.get(path)
+        # A preloaded sound plays straight away; the stamp check waits for the next preload
+        sound = cached[1] if cached is not None else self._load(path)
+        if self._channel is not None:
+            self._channel.stop()
+        self._channel = sound.play()
+        self.last_latency = time.perf_counter() - queued_at
@@ -0,0 +1,61 @@
+import os  # For file stamps and the cache folder
+import tempfile  # For writing cache files atomically
+import tkinter as tk
+
+SPRITE_FOLDER = "Pomodoro_cat"
+CACHE_FOLDER = os.path.join(SPRITE_FOLDER, ".cache")
+
+# (source path, size) -> (source stamp, PhotoImage), shared by every timer window in the process
+_photos = {}
+
+
+def cached_path(source, size, stamp):
+    # Where the resized copy of a source image lives; the name changes with the source file
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(CACHE_FOLDER, f"{stem}-{size[0]}x{size[1]}-{stamp[0]}-{stamp[1]}.png")
+
+
+def _resize(source, size, target):
+    # Resize a sprite with PIL and save it into the cache, dropping older copies of it
+    from PIL import Image  # only needed when the cache is missing or out of date
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    with Image.open(source) as image:
+        resized = image.resize(size)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(target) + ".", suffix=".tmp", dir=CACHE_FOLDER)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            resized.save(f, format='PNG')
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    prefix = os.path.basename(target).rsplit('-', 2)[0] + '-'  # "<stem>-<w>x<h>-"
+    for name in os.listdir(CACHE_FOLDER):
+        if name.startswith(prefix) and name.endswith('.png') and name != os.path.basename(target):
+            try:
+                os.remove(os.path.join(CACHE_FOLDER, name))
+            except OSError:
+                pass
+
+
+def sprite(name, size, master):
+    # A PhotoImage of Pomodoro_cat/<name> at `size`.
+    # The resized image is kept on disk keyed by the source's (mtime, size) and the target size,
+    # so only the first run (or a changed sprite) resizes with PIL; after that Tk loads the
+    # small cached PNG directly. Within a process the PhotoImage itself is reused by every window.
+    source = os.path.join(SPRITE_FOLDER, name)
+    st = os.stat(source)
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = (source, tuple(size))
+    cached = _photos.get(key)
+    if cached is not None and cached[0] == stamp and cached[1].tk is master.tk:
+        return cached[1]
+    target = cached_path(source, size, stamp)
+    if not os.path.exists(target):
+        _resize(source, tuple(size), target)
+    photo = tk.PhotoImage(master=master, file=target)
+    _photos[key] = (stamp, photo)
+    return photo
@@ -0,0 +1,117 @@
+import collections  # For the queue of unfinished tasks
+
+
+class Task:
+    # One entry in the Pomodoro task list; hw_id links it to a homework in the planner
+    def __init__(self, task_id, text, done=False, hw_id=None):
+        self.id = task_id
+        self.text = text
+        self.done = done
+        self.hw_id = hw_id
+
+    @property
+    def label(self):
+        # How the task is shown in the list
+        return f"✔ {self.text}" if self.done else self.text
+
+    def to_dict(self):
+        return {'id': self.id, 'text': self.text, 'done': self.done, 'hw_id': self.hw_id}
+
+    @classmethod
+    def from_dict(cls, data):
+        hw_id = data.get('hw_id')
+        return cls(int(data['id']), str(data['text']), bool(data.get('done')),
+                   int(hw_id) if hw_id is not None else None)
+
+
+class TaskList:
+    # The timer's tasks in display order, kept as records instead of display strings.
+    #
+    # A set of case-folded texts makes the duplicate check O(1), and a deque holds the IDs of
+    # unfinished tasks in order, so finding the next task to work on is O(1) amortized: IDs of
+    # tasks completed or deleted since are dropped lazily when they reach the front. Each ID's
+    # list position is kept in a dict, so finding a task's Listbox row is O(1) as well.
+    # to_dict()/from_dict() carry the list across sessions (in the timer's checkpoint).
+    def __init__(self):
+        self._tasks = {}  # id -> Task, in display order
+        self._order = []  # ids by list position
+        self._positions = {}  # id -> index in _order
+        self._keys = set()  # case-folded texts
+        self._unfinished = collections.deque()  # ids, oldest first; may hold stale ids
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        return (self._tasks[task_id] for task_id in self._order)
+
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    def at(self, index):
+        return self._tasks[self._order[index]]
+
+    def index(self, task_id):
+        return self._positions[task_id]
+
+    def contains(self, text):
+        return text.casefold() in self._keys
+
+    def add(self, text, hw_id=None):
+        # Append a task; None if one with the same text (ignoring case) already exists
+        if self.contains(text):
+            return None
+        task = Task(self._next_id, text, hw_id=hw_id)
+        self._next_id += 1
+        self._insert(task)
+        return task
+
+    def _insert(self, task):
+        self._tasks[task.id] = task
+        self._positions[task.id] = len(self._order)
+        self._order.append(task.id)
+        self._keys.add(task.text.casefold())
+        if not task.done:
+            self._unfinished.append(task.id)
+
+    def remove(self, task_id):
+        task = self._tasks.pop(task_id)
+        position = self._positions.pop(task_id)
+        del self._order[position]
+        for index in range(position, len(self._order)):  # the rows below move up one
+            self._positions[self._order[index]] = index
+        self._keys.discard(task.text.casefold())
+        return task
+
+    def clear(self):
+        self._tasks.clear()
+        self._order.clear()
+        self._positions.clear()
+        self._keys.clear()
+        self._unfinished.clear()
+
+    def complete(self, task_id):
+        self._tasks[task_id].done = True
+
+    def next_unfinished(self):
+        # The first unfinished task in list order, or None
+        while self._unfinished:
+            task = self._tasks.get(self._unfinished[0])
+            if task is not None and not task.done:
+                return task
+            self._unfinished.popleft()
+        return None
+
+    def to_dict(self):
+        return {'next_id': self._next_id, 'tasks': [task.to_dict() for task in self]}
+
+    @classmethod
+    def from_dict(cls, data):
+        tasks = cls()
+        for entry in data['tasks']:
+            task = Task.from_dict(entry)
+            if task.id not in tasks._tasks and not tasks.contains(task.text):
+                tasks._insert(task)
+        tasks._next_id = max([int(data.get('next_id', 1))] + [task_id + 1 for task_id in tasks._order])
+        return tasks
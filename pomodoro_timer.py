@@ -1,29 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import datetime
 import json
 import shutil
 import os
-import random
-from threading import Thread
-import pygame
+import time
 import webbrowser
-from PIL import Image, ImageTk
-
-class Timer:
-    # Timer base class for countdown logic
-    def __init__(self, duration=0):
-        self.duration = duration  # in seconds
-        self._remaining_time = duration
-        self.is_running = False
-
-    def start(self):
-        self.is_running = True
-
-    def pause(self):
-        self.is_running = False
-
-    def reset(self):
-        self._remaining_time = self.duration
+from file_utils import atomic_write
+from homework_store import HomeworkStore
+from focus_ledger import FocusLedger
+from pomodoro_engine import PomodoroEngine
+from pomodoro_sound import SoundPlayer
+from pomodoro_sprites import sprite
+from pomodoro_history import SessionLog
+from pomodoro_settings import SettingsFile
+from pomodoro_tasks import TaskList
+
+STATE_FILE = "pomodoro_state.json"  # checkpoint of the running timer, restored on the next open
+CHECKPOINT_SECONDS = 30  # how often the checkpoint is refreshed while the timer runs
 
 class ToolTip:
     # Tooltip helper for Tkinter widgets
@@ -72,11 +66,14 @@ class ToolTip:
             self.tip_window.destroy()
             self.tip_window = None
     
-class PomodoroTimer(Timer):
-    # Main Pomodoro Timer class with UI and gamification
+class PomodoroTimer:
+    # Main Pomodoro Timer window with UI and gamification; the timing rules live in PomodoroEngine
+    # The window that restored STATE_FILE and alone saves it; other timers opened meanwhile start
+    # fresh, so a session is never carried on (and its focus time counted) in two windows
+    _checkpoint_owner = None
+
     def __init__(self, root):
         # Initialize the Pomodoro timer window and variables
-        super().__init__(duration=25*60)
         self.root = root
         self.root.title("Purr-odoro Timer")
         self.root.configure(bg='#f5f5f5')
@@ -84,49 +81,56 @@ class PomodoroTimer(Timer):
 
         # Load settings or create default
         self.load_settings()
+        self.sound = SoundPlayer.shared()
+        self.preload_sounds()
 
         # Initialize variables
-        self.is_running = False
-        self.__is_focus = True
-        self.__remaining_time = self.settings['focus_time'] * 60
-        self.__pomodoro_count = 0
-        self.__coins = 10  # Starting coins
-        self.__current_task = ""
-        self.__tasks = [] 
+        self.engine = PomodoroEngine(self.settings['focus_time'], self.settings['break_time'],
+                                     self.settings['long_break_time'], coins=self.settings.get('coins', 10))
+        self.engine.subscribe(self.on_engine_event)
+        self.__current_task = None  # the Task being worked on
+        self.__tasks = TaskList()
         self.__cat_state = "normal"  # normal, sleeping, happy
-        self.__focus_sessions_in_cycle = 0
 
         self.__timer_after_id = None
-        self.__current_duration = self.settings['focus_time'] * 60
-        self.__remaining_time = self.__current_duration
+
+        # Homework picked as tasks keep its ID (Task.hw_id); their focus time goes to the ledger
+        self.__homework_store = HomeworkStore.shared("homework_data.json")
+        self.__ledger = FocusLedger.shared()
+        self.__focus_seconds = 0  # focus time on the current task not yet written to the ledger
+
+        # Every finished phase is logged for the history window
+        self.__sessions = SessionLog.shared()
+        self.__phase_started = None  # when the current phase was first started
+        self.__last_checkpoint = 0.0  # time.monotonic() of the last checkpoint
+        self.root.bind("<Destroy>", self.on_destroy, add="+")
 
         # Setup UI
         self.setup_ui()
+        if PomodoroTimer._checkpoint_owner is None:
+            PomodoroTimer._checkpoint_owner = self
+            self.restore_checkpoint()
 
     # Properties for private variables
     @property
     def is_focus(self):
-        return self.__is_focus
-
-    @is_focus.setter
-    def is_focus(self, value):
-        self.__is_focus = value
+        return self.engine.is_focus
 
     @property
     def pomodoro_count(self):
-        return self.__pomodoro_count
+        return self.engine.pomodoro_count
 
     @pomodoro_count.setter
     def pomodoro_count(self, value):
-        self.__pomodoro_count = value
+        self.engine.pomodoro_count = value
 
     @property
     def coins(self):
-        return self.__coins
+        return self.engine.coins
 
     @coins.setter
     def coins(self, value):
-        self.__coins = value
+        self.engine.coins = value
 
     @property
     def current_task(self):
@@ -154,11 +158,11 @@ class PomodoroTimer(Timer):
 
     @property
     def focus_sessions_in_cycle(self):
-        return self.__focus_sessions_in_cycle
+        return self.engine.focus_sessions_in_cycle
 
     @focus_sessions_in_cycle.setter
     def focus_sessions_in_cycle(self, value):
-        self.__focus_sessions_in_cycle = value
+        self.engine.focus_sessions_in_cycle = value
 
     @property
     def timer_after_id(self):
@@ -170,21 +174,21 @@ class PomodoroTimer(Timer):
 
     @property
     def current_duration(self):
-        return self.__current_duration
+        return self.engine.duration
 
-    @current_duration.setter
-    def current_duration(self, value):
-        self.__current_duration = value
+    @property
+    def focus_seconds(self):
+        return self.__focus_seconds
+
+    @focus_seconds.setter
+    def focus_seconds(self, value):
+        self.__focus_seconds = value
 
     def load_settings(self):
-        # Load settings from JSON or create defaults
-        try:
-            if os.path.exists('pomodoro_settings.json'):
-                with open('pomodoro_settings.json', 'r') as f:
-                    self.settings = json.load(f)
-            else:
-                self.create_default_settings()
-        except:
+        # Load settings from JSON (or its backup) or create defaults
+        self.settings_file = SettingsFile.shared()
+        self.settings = self.settings_file.load()
+        if self.settings is None:
             self.create_default_settings()
         
         # Load default sounds first time if not set
@@ -199,7 +203,7 @@ class PomodoroTimer(Timer):
             'focus_time': 25,
             'break_time': 5,
             'long_break_time': 10,
-            'coins': 0,
+            'coins': 10,  # Starting coins
             'cat_items': [],
             'focus_sound': None,
             'break_sound': None,
@@ -207,9 +211,8 @@ class PomodoroTimer(Timer):
         }
 
     def save_settings(self):
-        # Save current settings to JSON file
-        with open('pomodoro_settings.json', 'w') as f:
-            json.dump(self.settings, f)
+        # Save current settings to JSON file (written shortly after, in the background)
+        self.settings_file.save(self.settings)
 
     def setup_ui(self):
         # Build the main UI layout and widgets
@@ -224,7 +227,7 @@ class PomodoroTimer(Timer):
         self.bottom_frame.pack(pady=20)
 
         # Clock display
-        mins, secs = divmod(self._remaining_time, 60)
+        mins, secs = divmod(self.engine.remaining_time, 60)
         self.clock_label = tk.Label(
         self.top_frame,
         text=f"{mins:02d}:{secs:02d}",
@@ -249,6 +252,7 @@ class PomodoroTimer(Timer):
         self.task_listbox = tk.Listbox(task_frame, width=25, height=8, font=('Arial', 12),
                                exportselection=False, selectmode=tk.SINGLE)
         self.task_listbox.pack(pady=5)
+        self.task_listbox.bind("<<ListboxSelect>>", lambda event: self.save_checkpoint())
 
         # Buttons for tasks
         task_btn_frame = tk.Frame(task_frame, bg='#f5f5f5')
@@ -257,6 +261,7 @@ class PomodoroTimer(Timer):
         ttk.Button(task_btn_frame, text="Add Task", command=self.add_task).grid(row=0, column=0, padx=5)
         ttk.Button(task_btn_frame, text="Delete Task", command=self.delete_task).grid(row=0, column=1, padx=5)
         ttk.Button(task_btn_frame, text="Clear Tasks", command=self.clear_tasks).grid(row=0, column=2, padx=5)
+        ttk.Button(task_btn_frame, text="Add Homework", command=self.add_homework_task).grid(row=2, column=0, columnspan=3, pady=5)
         ToolTip(self.task_listbox, "💡 Select a task from the list before pressing Delete")
 
         # Mark Complete button (only visible during long breaks)
@@ -268,10 +273,10 @@ class PomodoroTimer(Timer):
         self.cat_canvas = tk.Canvas(self.middle_frame, width=200, height=200, bg='#f5f5f5', highlightthickness=0)
         self.cat_canvas.pack(side=tk.LEFT, padx=20)
 
-        # Load cat images
-        self.cat_normal = ImageTk.PhotoImage(Image.open("Pomodoro_cat/EyesOpen.png").resize((200, 200)))
-        self.cat_sleeping = ImageTk.PhotoImage(Image.open("Pomodoro_cat/Sleep.png").resize((200, 200)))
-        self.cat_happy = ImageTk.PhotoImage(Image.open("Pomodoro_cat/EyesOpenHeart.png").resize((200, 200)))
+        # Load cat images (resized once and cached, see pomodoro_sprites)
+        self.cat_normal = sprite("EyesOpen.png", (200, 200), self.root)
+        self.cat_sleeping = sprite("Sleep.png", (200, 200), self.root)
+        self.cat_happy = sprite("EyesOpenHeart.png", (200, 200), self.root)
 
         # initial cat image
         self.cat_image_id = self.cat_canvas.create_image(100, 100, image=self.cat_normal)
@@ -309,11 +314,16 @@ class PomodoroTimer(Timer):
         timer_button = ttk.Button(coin_frame, text="Timer Settings", command=self.open_timer_settings)
         timer_button.grid(row=0, column=3, padx=5, sticky='w')
 
+        # History button
+        history_button = ttk.Button(coin_frame, text="History", command=self.open_history_window)
+        history_button.grid(row=0, column=4, padx=5, sticky='w')
+
         # Make columns expand nicely if window resized
         coin_frame.grid_columnconfigure(0, weight=1)
         coin_frame.grid_columnconfigure(1, weight=0)
         coin_frame.grid_columnconfigure(2, weight=0)
-        coin_frame.grid_columnconfigure(3, weight=1)
+        coin_frame.grid_columnconfigure(3, weight=0)
+        coin_frame.grid_columnconfigure(4, weight=1)
         
 
     def update_cycle_display(self):
@@ -350,19 +360,17 @@ class PomodoroTimer(Timer):
 
         def save_task():
             # Save the new task and close the dialog
-            task = task_entry.get().strip()
-            if not task:
+            text = task_entry.get().strip()
+            if not text:
                 return
-            if any(task.lower() == t.lower().lstrip("✔ ").strip() for t in self.tasks):
+            task = self.tasks.add(text)
+            if task is None:
                 messagebox.showwarning("Duplicate Task", "This task already exists!")
                 return
-            self.tasks.append(task)
-            self.task_listbox.insert(tk.END, task)
-            last = self.task_listbox.size() - 1
-            self.task_listbox.selection_clear(0, tk.END)
-            self.task_listbox.selection_set(last)
-            self.task_listbox.see(last)
+            self.show_new_task(task)
+            self.record_focus_time()  # time so far belongs to the previous task
             self.current_task = task
+            self.save_checkpoint()
             task_window.destroy()
 
         ttk.Button(task_window, text="Add Task", command=save_task).pack(pady=10)
@@ -371,6 +379,160 @@ class PomodoroTimer(Timer):
         task_window.grab_set()            
         self.root.wait_window(task_window)
 
+    def add_homework_task(self):
+        # Offer pending homework from the planner as tasks; their focus time is logged per homework
+        try:
+            if self.__homework_store.reload_if_changed():
+                self.__homework_store.save()  # keep IDs given to entries saved before IDs existed
+        except Exception as e:
+            messagebox.showerror("Homework", f"Could not load homework: {e}")
+            return
+        pending = [self.__homework_store.get(hw_id) for hw_id in self.__homework_store.columns.ids_where(status="Pending")]
+        pending.sort(key=lambda hw: (hw.due_ordinal is None, hw.due_ordinal or 0, hw.id))
+        if not pending:
+            messagebox.showinfo("No Homework", "There is no pending homework in the planner.")
+            return
+
+        hw_window = tk.Toplevel(self.root)
+        hw_window.title("Add Homework Task")
+        hw_window.geometry("520x320")
+        tk.Label(hw_window, text="Pick a homework to work on:", font=('Arial', 12)).pack(pady=10)
+        hw_listbox = tk.Listbox(hw_window, width=60, height=10, font=('Arial', 10), selectmode=tk.SINGLE)
+        hw_listbox.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
+        for hw in pending:
+            estimate = f", est. {hw.time_required} min" if hw.is_timed else ""
+            hw_listbox.insert(tk.END, f"{hw.subject}: {hw.title} (due {hw.due_date}{estimate}, "
+                              f"done {self.__ledger.minutes(hw.id)} min)")
+
+        def save_homework_task():
+            selection = hw_listbox.curselection()
+            if not selection:
+                return
+            hw = pending[selection[0]]
+            task = self.tasks.add(f"{hw.subject}: {hw.title}".strip(), hw_id=hw.id)
+            if task is None:
+                messagebox.showwarning("Duplicate Task", "This task already exists!")
+                return
+            self.show_new_task(task)
+            self.save_checkpoint()
+            hw_window.destroy()
+
+        ttk.Button(hw_window, text="Add Task", command=save_homework_task).pack(pady=10)
+        hw_window.transient(self.root)
+        hw_window.grab_set()
+        self.root.wait_window(hw_window)
+
+    def show_new_task(self, task):
+        # Add a task to the end of the Listbox and select it
+        self.task_listbox.insert(tk.END, task.label)
+        last = self.task_listbox.size() - 1
+        self.task_listbox.selection_clear(0, tk.END)
+        self.task_listbox.selection_set(last)
+        self.task_listbox.see(last)
+
+    def selected_task(self):
+        # The Task selected in the Listbox, or None
+        selection = self.task_listbox.curselection()
+        return self.tasks.at(selection[0]) if selection else None
+
+    def record_focus_time(self):
+        # Write the focus time spent on the current task to the ledger, if it is a homework
+        task = self.current_task
+        if task is not None and task.hw_id is not None and self.focus_seconds > 0:
+            try:
+                self.__ledger.record(task.hw_id, self.focus_seconds)
+            except OSError as e:
+                print(f"Error recording focus time: {e}")
+        self.focus_seconds = 0
+
+    def save_checkpoint(self):
+        # Write the timer and task state to a small file, replaced atomically
+        if PomodoroTimer._checkpoint_owner is not self:
+            return
+        try:
+            selection = self.task_listbox.curselection()
+        except tk.TclError:
+            selection = ()  # the window is being destroyed
+        state = {
+            'saved_at': time.time(),
+            'engine': self.engine.state(),
+            'phase_started': self.__phase_started.isoformat() if self.__phase_started else None,
+            'tasks': self.tasks.to_dict(),
+            'current_task': self.current_task.id if self.current_task else None,
+            'selected': selection[0] if selection else None,
+            'focus_seconds': self.focus_seconds,
+        }
+        try:
+            atomic_write(STATE_FILE, json.dumps(state))
+        except OSError as e:
+            print(f"Error saving timer checkpoint: {e}")
+        self.__last_checkpoint = time.monotonic()
+
+    def restore_checkpoint(self):
+        # Carry on from the last checkpoint; a running phase lost the time the window was closed
+        if not os.path.exists(STATE_FILE):
+            return
+        try:
+            with open(STATE_FILE, 'r') as f:
+                state = json.load(f)
+            if not isinstance(state, dict):
+                raise ValueError("not a checkpoint")
+        except (OSError, ValueError) as e:
+            print(f"Could not restore the timer checkpoint: {e}")
+            return
+
+        # The task list is restored on its own, so the tasks survive a damaged timer state
+        try:
+            tasks = TaskList.from_dict(state['tasks'])
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Could not restore the Pomodoro tasks: {e}")
+            tasks = TaskList()
+        self.tasks = tasks
+        for index, task in enumerate(tasks):
+            self.task_listbox.insert(tk.END, task.label)
+            if task.done:
+                self.task_listbox.itemconfig(index, fg="gray")
+        selected = state.get('selected')
+        if isinstance(selected, int) and 0 <= selected < len(tasks):
+            self.task_listbox.selection_set(selected)
+            self.task_listbox.see(selected)
+
+        # The rest is read and checked first and the engine restored last, so a bad timer state
+        # leaves the timer as it was opened
+        try:
+            elapsed = time.time() - float(state['saved_at'])
+            phase_started = state['phase_started']
+            phase_started = datetime.datetime.fromisoformat(phase_started) if phase_started else None
+            focus_seconds = max(0, int(state['focus_seconds']))
+            current_task = tasks.get(state['current_task'])
+            self.engine.restore(state['engine'], elapsed=elapsed)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Could not restore the timer state: {e}")
+            return
+
+        self.__phase_started = phase_started
+        self.focus_seconds = focus_seconds
+        self.current_task = current_task
+
+        self.update_mode_label()
+        self.update_display()
+        self.update_cycle_display()
+        self.set_cat_state("sleeping" if self.is_focus else "normal")
+        if self.engine.is_running:
+            self.start_button.config(state=tk.DISABLED)
+            self.pause_button.config(state=tk.NORMAL)
+            self.timer_after_id = self.root.after(0, self.update_timer)
+
+    def on_destroy(self, event):
+        # Keep the focus time of a session that is cut short by closing the window
+        if event.widget is self.root:
+            self.record_focus_time()
+            self.save_checkpoint()
+            if PomodoroTimer._checkpoint_owner is self:
+                PomodoroTimer._checkpoint_owner = None
+            self.__sessions.save_rollups()
+            self.settings_file.flush()
+
     def delete_task(self):
         # Delete the selected task from the list
         if not self.tasks:  # Check if task list is empty
@@ -383,23 +545,17 @@ class PomodoroTimer(Timer):
             messagebox.showwarning("No Task Selected", "Please select a task to delete!")
             return
         
-        selection = self.task_listbox.curselection()
-        if not selection:
-            return
-        
         # If multiple are selected (if you ever change selectmode), delete in reverse order
-        indices = list(selection)
-        for index in reversed(indices):
+        for index in reversed(selection):
             # remove from backing list and Listbox
-            try:
-                del self.tasks[index]
-            except IndexError:
-                pass
-        self.task_listbox.delete(index)
-
-        # If current_task was deleted, clear it
-        if self.current_task and self.current_task not in self.tasks:
-            self.current_task = ""
+            task = self.tasks.at(index)
+            if task is self.current_task:
+                # If current_task was deleted, clear it
+                self.record_focus_time()
+                self.current_task = None
+            self.tasks.remove(task.id)
+            self.task_listbox.delete(index)
+        self.save_checkpoint()
 
     def clear_tasks(self):
         # Remove all tasks from the list after confirmation
@@ -408,9 +564,11 @@ class PomodoroTimer(Timer):
             return
 
         if messagebox.askyesno("Clear All Tasks", "Remove ALL tasks?"):
+            self.record_focus_time()
             self.tasks.clear()
             self.task_listbox.delete(0, tk.END)
-            self.current_task = ""
+            self.current_task = None
+            self.save_checkpoint()
 
 
     def start_timer(self):
@@ -419,75 +577,77 @@ class PomodoroTimer(Timer):
             self.root.after_cancel(self.timer_after_id)
             self.timer_after_id = None
 
-        if not self.is_running:
-            super().start()  # sets self.is_running = True
-            self.start_button.config(state=tk.DISABLED)
-            self.pause_button.config(state=tk.NORMAL)
-
         if self.is_focus:
             # For focus sessions, ensure a task is selected
-            selected_indices = self.task_listbox.curselection()
-            if not selected_indices:
+            selected_task = self.selected_task()
+            if selected_task is None:
                 messagebox.showwarning("No Task", "Please select or add a task first!")
                 return
 
-            selected_task = self.task_listbox.get(selected_indices[0]).strip()
-
             # Prevent starting on completed task
-            if selected_task.startswith("✔"):
+            if selected_task.done:
                 messagebox.showwarning("Task Completed", "Please select or add a new task before starting.")
                 return
 
-            # Set current task
+            # Set current task (time so far belongs to the previous one)
+            if selected_task is not self.current_task:
+                self.record_focus_time()
             self.current_task = selected_task
 
             # Play focus sound & set cat state
             if self.settings['focus_sound']:
-                Thread(target=self.play_sound, args=(self.settings['focus_sound'],)).start()
+                self.play_sound(self.settings['focus_sound'])
             self.set_cat_state("sleeping")
 
         else:
             # Break mode — no task required
             if self.settings['break_sound']:
-                Thread(target=self.play_sound, args=(self.settings['break_sound'],)).start()
+                self.play_sound(self.settings['break_sound'])
                 self.set_cat_state("normal")
 
+        if not self.engine.is_running:
+            if self.__phase_started is None:
+                self.__phase_started = datetime.datetime.now()
+            self.engine.start()
+            self.start_button.config(state=tk.DISABLED)
+            self.pause_button.config(state=tk.NORMAL)
+            self.save_checkpoint()
+
         # Start ticking
         self.update_timer()
 
     def pause_timer(self):
         # Pause the timer and update button states
-        if self.is_running:
-            super().pause()
+        if self.engine.is_running:
+            self.engine.pause()
+            self.record_focus_time()
             self.start_button.config(state=tk.NORMAL)
             self.pause_button.config(state=tk.DISABLED)
-            pygame.mixer.music.stop()
+            self.sound.stop()
+            self.save_checkpoint()
 
     def skip_timer(self):
-        # Skip the current timer phase, optionally marking task complete
-        selected_indices = self.task_listbox.curselection()
-        if self.is_focus and not selected_indices:
+        # Skip the current timer phase; a skipped focus session still counts and earns coins
+        selected_task = self.selected_task()
+        if self.is_focus and selected_task is None:
             messagebox.showwarning("No Task", "Please select or add a task first!")
             return
 
-        selected_task = self.task_listbox.get(selected_indices[0]).strip()
-        if selected_task.startswith("✔"):
-            messagebox.showwarning("Task Completed", "Please select or add a new task before skipping.")
-            return
-
-        self.current_task = selected_task
-        self.is_running = False
+        if selected_task is not None:
+            if selected_task.done:
+                messagebox.showwarning("Task Completed", "Please select or add a new task before skipping.")
+                return
+            if selected_task is not self.current_task:
+                self.record_focus_time()
+            self.current_task = selected_task
 
         # Cancel pending timer update if exists
         if self.timer_after_id:
             self.root.after_cancel(self.timer_after_id)
             self.timer_after_id = None
 
-        # If skipping a focus session, still mark task as complete and award coins
-        if self.is_focus:
-            self.complete_focus_session()
-    
-        self.next_phase()
+        self.engine.skip()
+        self.record_focus_time()
 
         # Allow user to start again
         self.start_button.config(state=tk.NORMAL)
@@ -500,61 +660,53 @@ class PomodoroTimer(Timer):
             self.root.after_cancel(self.timer_after_id)
             self.timer_after_id = None
 
-        # Fully stop the timer
-        self.is_running = False
-        super().reset()
-
-        # Set remaining_time based on current mode
-        if self.is_focus:
-            self._remaining_time = self.settings['focus_time'] * 60
-            self.mode_label.config(text="Focus Time", fg='#d63031')
-        else:
-            self._remaining_time = self.settings['break_time'] * 60
-            self.mode_label.config(text="Break Time", fg='#00b894')
-
+        # Fully stop the timer; the phase starts over, so it is not logged
+        self.engine.reset()
+        self.__phase_started = None
+        self.record_focus_time()
+        self.update_mode_label()
         self.update_display()
         self.start_button.config(state=tk.NORMAL)
         self.pause_button.config(state=tk.DISABLED)
+        self.save_checkpoint()
 
     def update_timer(self):
-        # Update the timer countdown every second
-        if self._remaining_time > 0 and self.is_running:
-            self._remaining_time -= 1 
-            mins, secs = divmod(self._remaining_time, 60)
-            self.clock_label.config(text=f"{mins:02d}:{secs:02d}")
-            self.timer_after_id = self.root.after(1000, self.update_timer)
-        elif self._remaining_time <= 0:
-            self.timer_complete()
+        # Redraw from the true time left and wake up again just after the next whole second,
+        # so a late tick is caught up instead of pushing the end of the session back.
+        # When the phase runs out the engine moves on and reports it through on_engine_event.
+        wait = self.engine.update()
+        self.update_display()
+        if wait is not None:
+            self.timer_after_id = self.root.after(int(wait * 1000) + 5, self.update_timer)
+            if time.monotonic() - self.__last_checkpoint >= CHECKPOINT_SECONDS:
+                self.save_checkpoint()
+        else:
+            self.timer_after_id = None
+            self.start_button.config(state=tk.NORMAL)
+            self.pause_button.config(state=tk.DISABLED)
 
     def mark_task_complete(self):
         # Mark the selected task as complete and award coins
-        selected_indices = self.task_listbox.curselection()
-        if not selected_indices:
+        task = self.selected_task()
+        if task is None:
             messagebox.showwarning("No Task Selected", "Please select a task to mark as complete!")
             return
     
-        index = selected_indices[0]
-        task_text = self.task_listbox.get(index).lstrip("✔ ").strip()
-    
         # Don't mark already completed tasks
-        if task_text.startswith("✔"):
+        if task.done:
             messagebox.showinfo("Already Complete", "This task is already marked as complete!")
             return
     
         # Mark task as complete
+        self.tasks.complete(task.id)
+        index = self.tasks.index(task.id)
         self.task_listbox.delete(index)
-        self.task_listbox.insert(index, f"✔ {task_text}")
+        self.task_listbox.insert(index, task.label)
         self.task_listbox.itemconfig(index, fg="gray")
+        self.save_checkpoint()
     
-        # Update backing list
-        self.tasks[index] = f"✔ {task_text}"
-    
-        # Award coins for completing task
-        coins_earned = random.randint(1, 3)
-        self.coins += coins_earned
-        self.settings['coins'] = self.coins
-        self.save_settings()
-        self.coin_label.config(text=f"Coins: {self.coins}")
+        # Award coins for completing task (the coin label updates from the engine event)
+        coins_earned = self.engine.award_coins()
     
         # Show happy cat briefly
         def show_happy_cat():
@@ -563,94 +715,77 @@ class PomodoroTimer(Timer):
     
         messagebox.showinfo("Task Complete!", f"Task marked as complete! You earned {coins_earned} coins!")
 
-    def timer_complete(self):
-        # Handle logic when the timer reaches zero
-        self.is_running = False
-
-        if self.is_focus:
-            # Focus session completed
-            self.pomodoro_count += 1
-            messagebox.showinfo("Focus Completed", f"Great job! You've completed {self.pomodoro_count} focus sessions!")
-    
-        # Move to next phase
-        self.next_phase()
-        self.start_button.config(state=tk.NORMAL)
-        self.pause_button.config(state=tk.DISABLED)
-
-    def complete_focus_session(self):
-        # Complete a focus session, award coins, and select next task
-        # Increment total Pomodoro count only
-        self.pomodoro_count += 1
-
-        # Award coins
-        coins_earned = random.randint(1, 3)
-        self.coins += coins_earned
-        self.settings['coins'] = self.coins
-        self.save_settings()
-        self.coin_label.config(text=f"Coins: {self.coins}")
-
-        # Auto-select the next unfinished task
-        next_task = None
-        for i in range(self.task_listbox.size()):
-            task_text = self.task_listbox.get(i)
-            if not task_text.startswith("✔"):
-                next_task = task_text
-                self.task_listbox.selection_clear(0, tk.END)
-                self.task_listbox.selection_set(i)
-                self.task_listbox.see(i)
-                break
-
-        if next_task:
-            self.current_task = next_task
-        else:
-            self.current_task = ""
-            messagebox.showinfo("No Tasks Left", "All tasks are complete! Please add a new one.")
-
-    def next_phase(self):
-        # Switch between focus, short break, and long break phases
-        if self.is_focus:
-            # End of focus session → increment cycle counter
-            self.focus_sessions_in_cycle += 1
-
-            # Every 4th focus → long break
-            if self.focus_sessions_in_cycle % 4 == 0:
-                self.is_focus = False
-                self.current_duration = self.settings['long_break_time'] * 60
-                self.mode_label.config(text="Long Break Time", fg='#0984e3')
-                self.mark_complete_button.grid()  # show "Mark Complete" button
-
+    def on_engine_event(self, event, data):
+        # The engine owns the Pomodoro rules; this only mirrors its changes in the window
+        if event == 'focus_time':
+            self.focus_seconds += data['seconds']
+        elif event == 'phase_ended':
+            self.log_session(data)
+        elif event == 'focus_completed':
+            self.record_focus_time()
+            if data['skipped']:
+                self.select_next_task()
+            else:
+                messagebox.showinfo("Focus Completed", f"Great job! You've completed {self.pomodoro_count} focus sessions!")
+        elif event == 'coins_awarded':
+            self.settings['coins'] = self.coins
+            self.save_settings()
+            self.coin_label.config(text=f"Coins: {self.coins}")
+        elif event == 'phase_changed':
+            self.update_mode_label()
+            if data['phase'] == PomodoroEngine.LONG_BREAK:
                 if self.settings.get('task_complete_sound'):
-                    Thread(target=self.play_sound, args=(self.settings['task_complete_sound'],)).start()
-                    
+                    self.play_sound(self.settings['task_complete_sound'])
                 messagebox.showinfo("Long Break!",
                 f"Time for a {self.settings['long_break_time']}-minute long break!\n\n"
                 "One Pomodoro cycle completed!\n"
                 "Use the 'Mark Complete' button to mark any tasks you've finished.")
-            else:
-                # Otherwise → short break
-                self.is_focus = False
-                self.current_duration = self.settings['break_time'] * 60
-                self.mode_label.config(text="Break Time", fg='#00b894')
-                self.mark_complete_button.grid_remove()
-
-            self.set_cat_state("normal")
+            self.set_cat_state("sleeping" if self.is_focus else "normal")
+            self.update_display()
+            self.update_cycle_display()
+            self.save_checkpoint()
+
+    def log_session(self, data):
+        # Add the phase that just ended to the session log
+        ended = datetime.datetime.now()
+        started = self.__phase_started or ended
+        self.__phase_started = None
+        task = self.current_task.text if self.current_task and data['phase'] == PomodoroEngine.FOCUS else ""
+        try:
+            self.__sessions.record(data['phase'], started, ended, data['planned'], data['actual'],
+                                   task, data['skipped'])
+        except OSError as e:
+            print(f"Error logging Pomodoro session: {e}")
 
+    def select_next_task(self):
+        # Auto-select the next unfinished task
+        next_task = self.tasks.next_unfinished()
+        if next_task:
+            index = self.tasks.index(next_task.id)
+            self.task_listbox.selection_clear(0, tk.END)
+            self.task_listbox.selection_set(index)
+            self.task_listbox.see(index)
         else:
-            # Break finished → go back to focus
-            self.is_focus = True
-            self.current_duration = self.settings['focus_time'] * 60
+            messagebox.showinfo("No Tasks Left", "All tasks are complete! Please add a new one.")
+        self.current_task = next_task
+
+    def update_mode_label(self):
+        # Show the current phase and whether tasks can be marked complete
+        phase = self.engine.phase
+        if phase == PomodoroEngine.FOCUS:
             self.mode_label.config(text="Focus Time", fg='#d63031')
+        elif phase == PomodoroEngine.LONG_BREAK:
+            self.mode_label.config(text="Long Break Time", fg='#0984e3')
+        else:
+            self.mode_label.config(text="Break Time", fg='#00b894')
+        if phase == PomodoroEngine.LONG_BREAK:
+            self.mark_complete_button.grid()  # show "Mark Complete" button
+        else:
             self.mark_complete_button.grid_remove()
-            self.set_cat_state("sleeping")
-
-        # Reset timer for the new phase
-        self._remaining_time = self.current_duration
-        self.update_display()
-        self.update_cycle_display()
 
     def update_display(self):
         # Update the timer display label
-        mins, secs = divmod(self._remaining_time, 60)
+        mins, secs = divmod(self.engine.remaining_time, 60)
         self.clock_label.config(text=f"{mins:02d}:{secs:02d}")
 
     def save_timer_settings(self):
@@ -670,13 +805,8 @@ class PomodoroTimer(Timer):
             self.settings['break_time'] = brk
             self.settings['long_break_time'] = long_brk
 
-            # Update current timer duration (in seconds)
-            if self.is_focus:
-                self.duration = focus * 60
-            else:
-                self.duration = brk * 60
-
-            self._remaining_time = self.duration  # reset countdown
+            # The current phase starts over with its new length
+            self.engine.set_durations(focus, brk, long_brk)
             self.update_display()
             self.save_settings()  # write to JSON 
         
@@ -707,19 +837,19 @@ class PomodoroTimer(Timer):
                 # Save the relative path in settings
                 self.settings[sound_type] = destination
                 self.save_settings()
+                self.preload_sounds()
                 messagebox.showinfo("Sound Saved", f"{sound_type.replace('_', ' ').title()} saved successfully!")
             except Exception as e:
                 messagebox.showerror("Error", f"Could not save sound: {e}")
 
     def play_sound(self, sound_file):
-        # Play a sound file using pygame
-        try:
-            if sound_file:  
-                pygame.mixer.init()
-                pygame.mixer.music.load(sound_file)
-                pygame.mixer.music.play()
-        except Exception as e:
-            print(f"Error playing sound: {e}")
+        # Queue a sound cue on the audio worker
+        self.sound.play(sound_file)
+
+    def preload_sounds(self):
+        # Decode the cue sounds now so they play without delay later
+        self.sound.preload(self.settings['focus_sound'], self.settings['break_sound'],
+                           self.settings['task_complete_sound'])
 
     def open_music_app(self):
         # Open YouTube Music in the browser
@@ -844,6 +974,63 @@ class PomodoroTimer(Timer):
 
         ttk.Button(settings_window, text="Save Settings", command=self.save_timer_settings).pack(pady=10)
 
+    def open_history_window(self):
+        # Focus history from the session log: totals, streaks and the last weeks
+        sessions = self.__sessions
+        today = datetime.date.today()
+        history_window = tk.Toplevel(self.root)
+        history_window.title("Focus History")
+        history_window.geometry("760x760")
+        history_window.configure(bg='#f5f5f5')
+
+        tk.Label(history_window, text="Focus History", font=('Arial', 16, 'bold'), bg='#f5f5f5').pack(pady=10)
+
+        minutes, completed, skipped = sessions.totals()
+        current, longest = sessions.streaks(today)
+        week = sessions.weekly_minutes(1, today)[0][1]
+        summary = (f"Today: {sessions.focus_minutes(today)} min    This week: {week} min\n"
+                   f"All time: {minutes} min in {completed} sessions ({skipped} skipped)\n"
+                   f"Streak: {current} day{'s' if current != 1 else ''}    Longest: {longest}")
+        tk.Label(history_window, text=summary, font=('Arial', 11), bg='#f5f5f5', justify=tk.LEFT).pack(pady=5)
+
+        # Heatmap and trend, drawn as one image for the chosen range
+        ranges = {"Last year": 364, "Last 3 years": 3 * 365, "All time": None}
+        range_var = tk.StringVar(value="Last year")
+        ttk.Combobox(history_window, textvariable=range_var, values=list(ranges), state='readonly',
+                     width=14).pack()
+        chart_canvas = tk.Canvas(history_window, width=720, height=320, bg='#f5f5f5', highlightthickness=0)
+        chart_canvas.pack(pady=5)
+
+        def draw_chart():
+            from PIL import ImageTk  # the chart modules (PIL, NumPy) load only when the history is drawn
+            from pomodoro_charts import render_history
+            last = today.toordinal()
+            span = ranges[range_var.get()]
+            if span is None:
+                days = [datetime.date.fromisoformat(day).toordinal() for day in sessions.days]
+                first = min(days + [last - 364])
+            else:
+                first = last - span
+            image = render_history(sessions.days, first, last, 720)
+            chart_canvas.photo = ImageTk.PhotoImage(image, master=chart_canvas)  # keep a reference
+            chart_canvas.config(height=image.height)
+            chart_canvas.delete('all')
+            chart_canvas.create_image(0, 0, image=chart_canvas.photo, anchor=tk.NW)
+
+        range_var.trace_add('write', lambda *args: draw_chart())
+        draw_chart()
+
+        tree = ttk.Treeview(history_window, columns=("Week", "Minutes"), show='headings', height=6)
+        tree.heading("Week", text="Week of")
+        tree.heading("Minutes", text="Focus Minutes")
+        tree.column("Week", width=160, anchor=tk.CENTER)
+        tree.column("Minutes", width=160, anchor=tk.CENTER)
+        for monday, week_minutes in reversed(sessions.weekly_minutes(12, today)):
+            tree.insert('', tk.END, values=(monday.strftime("%d %b %Y"), week_minutes))
+        tree.pack(pady=10)
+
+        ttk.Button(history_window, text="Close", command=history_window.destroy).pack(pady=5)
+
     def center_window(self, width, height):
         screen_width = self.root.winfo_screenwidth()
         screen_height = self.root.winfo_screenheight()
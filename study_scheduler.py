@@ -0,0 +1,224 @@
+import json  # For reading/writing calendar data
+import os    # For file existence checks
+import bisect  # For finding where an incremental re-plan starts
+import datetime  # For date handling
+import heapq  # For the earliest-deadline-first queue
+from file_utils import atomic_write  # For crash-safe calendar writes
+from homework_store import parse_due_ordinal
+
+CALENDAR_FILE = "calendar_data.json"
+
+
+def to_minutes(hhmm):
+    # "HH:MM" -> minutes after midnight
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def to_hhmm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class StudyScheduler:
+    # Packs pending timed homework into the free time around calendar events.
+    #
+    # Tasks are taken earliest-deadline-first from a heap and poured into the free slots in
+    # time order, in blocks of at most MAX_BLOCK minutes. Work has to happen before the due
+    # date; whatever does not fit is reported in `unscheduled`.
+    #
+    # Because every task is available from the start of the plan, a task's blocks only depend
+    # on the tasks ahead of it in deadline order. The slot cursor before each task is kept, so
+    # when one homework changes only the tasks from its (old or new) deadline onwards are
+    # re-packed.
+    DAY_START = 9 * 60    # study window, minutes after midnight
+    DAY_END = 21 * 60
+    MAX_BLOCK = 60        # longest single study block
+    MIN_BLOCK = 15        # don't leave fragments shorter than this (unless that finishes the task)
+    BREAK = 10            # gap after each block
+    EVENT_MINUTES = 60    # busy time assumed for calendar events that only have a start time
+    HORIZON_DAYS = 183    # plan at least a semester ahead
+
+    def __init__(self, store, calendar_file=CALENDAR_FILE):
+        self.store = store
+        self.calendar_file = calendar_file
+        self.blocks = {}        # hw_id -> [(day ordinal, start minute, end minute), ...]
+        self.unscheduled = {}   # hw_id -> minutes that could not fit before the due date
+        self.has_plan = False
+        self._slots = []        # free (day ordinal, start minute, end minute), in time order
+        self._order = []        # (due ordinal, hw_id) of every task, in the order it was packed
+        self._cursors = []      # (slot index, minute) before each entry of _order
+        self._end_cursor = (0, 0)
+        self._first_day = None
+        self._last_day = None
+        self._calendar_stamp = None
+
+    # ----- Inputs -----
+    def pending_tasks(self):
+        # Pending timed homework that still needs time, by ID
+        tasks = {}
+        for hw_id in self.store.columns.ids_where(status="Pending"):
+            hw = self.store.get(hw_id)
+            if hw.is_timed and hw.due_ordinal is not None and hw.time_required > 0:
+                tasks[hw_id] = hw
+        return tasks
+
+    def _calendar_file_stamp(self):
+        try:
+            st = os.stat(self.calendar_file)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def load_calendar(self):
+        if not os.path.exists(self.calendar_file):
+            return {}
+        with open(self.calendar_file, "r") as f:
+            return json.load(f)
+
+    def _event_interval(self, ev):
+        # Busy (start, end) minutes of a calendar event, or None if it has no usable time
+        try:
+            if ev.get("startTime") and ev.get("endTime"):
+                return to_minutes(ev["startTime"]), to_minutes(ev["endTime"])
+            start = to_minutes(ev["time"])
+            return start, start + self.EVENT_MINUTES
+        except (KeyError, ValueError, AttributeError):
+            return None
+
+    def _build_slots(self, events, first_day, first_minute, last_day):
+        busy = {}
+        for date_str, day_events in events.items():
+            day = parse_due_ordinal(date_str)
+            if day is None or not first_day <= day <= last_day:
+                continue
+            for ev in day_events:
+                if ev.get("studyPlan"):
+                    continue  # our own blocks from the previous plan are replaced, not avoided
+                interval = self._event_interval(ev)
+                if interval:
+                    busy.setdefault(day, []).append(interval)
+        slots = []
+        for day in range(first_day, last_day + 1):
+            cursor = max(self.DAY_START, first_minute) if day == first_day else self.DAY_START
+            for start, end in sorted(busy.get(day, ())):
+                if min(start, self.DAY_END) - cursor >= self.MIN_BLOCK:
+                    slots.append((day, cursor, min(start, self.DAY_END)))
+                cursor = max(cursor, end)
+            if self.DAY_END - cursor >= self.MIN_BLOCK:
+                slots.append((day, cursor, self.DAY_END))
+        return slots
+
+    # ----- Planning -----
+    def plan(self, now=None):
+        # Plan every pending timed homework from scratch
+        now = now or datetime.datetime.now()
+        tasks = self.pending_tasks()
+        self._first_day = now.date().toordinal()
+        last_due = max((hw.due_ordinal for hw in tasks.values()), default=self._first_day)
+        self._last_day = max(last_due - 1, self._first_day + self.HORIZON_DAYS)
+        # Start from the next quarter hour
+        first_minute = -(-(now.hour * 60 + now.minute) // 15) * 15
+        self._calendar_stamp = self._calendar_file_stamp()
+        self._slots = self._build_slots(self.load_calendar(), self._first_day, first_minute, self._last_day)
+        self.blocks = {}
+        self.unscheduled = {}
+        self._order = []
+        self._cursors = []
+        self._pack([(hw.due_ordinal, hw_id) for hw_id, hw in tasks.items()], tasks, (0, 0))
+        self.has_plan = True
+        return self.blocks
+
+    def update(self, changed_ids, now=None):
+        # Re-plan after the given homework were added, edited or deleted.
+        # Falls back to a full plan when the day, the calendar or the horizon changed.
+        now = now or datetime.datetime.now()
+        if (not self.has_plan or now.date().toordinal() != self._first_day
+                or self._calendar_file_stamp() != self._calendar_stamp):
+            return self.plan(now)
+        changed = set(changed_ids)
+        tasks = self.pending_tasks()
+        keys = [key for key in self._order if key[1] in changed]
+        keys += [(tasks[hw_id].due_ordinal, hw_id) for hw_id in changed if hw_id in tasks]
+        if not keys:
+            return self.blocks
+        if any(due - 1 > self._last_day for due, _ in keys):
+            return self.plan(now)
+        # Tasks with an earlier deadline than every changed one keep their blocks
+        first = min(keys)
+        k = bisect.bisect_left(self._order, first)
+        cursor = self._cursors[k] if k < len(self._cursors) else self._end_cursor
+        for _, hw_id in self._order[k:]:
+            self.blocks.pop(hw_id, None)
+            self.unscheduled.pop(hw_id, None)
+        for hw_id in changed:
+            self.blocks.pop(hw_id, None)
+            self.unscheduled.pop(hw_id, None)
+        del self._order[k:]
+        del self._cursors[k:]
+        suffix = [(hw.due_ordinal, hw_id) for hw_id, hw in tasks.items() if (hw.due_ordinal, hw_id) >= first]
+        self._pack(suffix, tasks, cursor)
+        return self.blocks
+
+    def _pack(self, keys, tasks, cursor):
+        heap = list(keys)
+        heapq.heapify(heap)
+        slots = self._slots
+        slot_i, pos = cursor
+        while heap:
+            due, hw_id = heapq.heappop(heap)
+            self._order.append((due, hw_id))
+            self._cursors.append((slot_i, pos))
+            remaining = tasks[hw_id].time_required
+            blocks = []
+            # A task that can't fit leaves the cursor where it was for the tasks after it
+            i, p = slot_i, pos
+            while remaining > 0 and i < len(slots):
+                day, start, end = slots[i]
+                if day >= due:
+                    break
+                begin = max(start, p)
+                length = min(remaining, self.MAX_BLOCK, end - begin)
+                if length <= 0 or (length < self.MIN_BLOCK and length < remaining):
+                    i, p = i + 1, 0
+                    continue
+                blocks.append((day, begin, begin + length))
+                remaining -= length
+                p = begin + length + self.BREAK
+                if p >= end:
+                    i, p = i + 1, 0
+            if blocks:
+                self.blocks[hw_id] = blocks
+            if remaining > 0:
+                self.unscheduled[hw_id] = remaining
+                if blocks:
+                    # Partly placed: keep those blocks and move on from where they ended
+                    slot_i, pos = i, p
+            else:
+                slot_i, pos = i, p
+        self._end_cursor = (slot_i, pos)
+
+    # ----- Output -----
+    def write_calendar(self):
+        # Replace the previous plan's study blocks in the calendar file with the current ones
+        events = self.load_calendar()
+        for date_str in list(events):
+            kept = [ev for ev in events[date_str] if not ev.get("studyPlan")]
+            if kept:
+                events[date_str] = kept
+            else:
+                del events[date_str]
+        for hw_id, blocks in self.blocks.items():
+            hw = self.store.get(hw_id)
+            for day, start, end in blocks:
+                date_str = datetime.date.fromordinal(day).isoformat()
+                events.setdefault(date_str, []).append({
+                    "title": f"Study: {hw.title or hw.subject}",
+                    "category": "Timetable",
+                    "time": f"{to_hhmm(start)}-{to_hhmm(end)}",
+                    "startTime": to_hhmm(start),
+                    "endTime": to_hhmm(end),
+                    "homeworkId": hw_id,
+                    "studyPlan": True
+                })
+        atomic_write(self.calendar_file, json.dumps(events, indent=2))
+        self._calendar_stamp = self._calendar_file_stamp()